@@ -50,7 +50,7 @@ async def send_message(
         HTML response for htmx, JSON for API clients, or streaming response
     """
     try:
-        logger.info(f"Sending message from user {user_session.user_info.user_id}: {message[:100]}... (stream={stream})")
+        logger.info("Sending message from user %s: %s... (stream=%s)", user_session.user_info.user_id, message[:100], stream)
         
         # Check if this is an htmx request
         is_htmx = request.headers.get("HX-Request") == "true"
@@ -72,7 +72,7 @@ async def send_message(
             return await _handle_regular_response(chat_request, user_session, request, is_htmx)
             
     except Exception as e:
-        logger.error(f"Send message error: {e}")
+        logger.error("Send message error: %s", e)
         if is_htmx:
             return HTMLResponse(
                 content=f'<div class="text-red-600 p-4">エラーが発生しました: {str(e)}</div>',
@@ -144,7 +144,7 @@ async def _handle_regular_response(
                 }
             )
             
-            logger.info(f"Successfully processed message for user {user_session.user_info.user_id}")
+            logger.info("Successfully processed message for user %s", user_session.user_info.user_id)
             
             if is_htmx:
                 # Return HTML for htmx
@@ -169,7 +169,7 @@ async def _handle_regular_response(
             # Mark user message as error and return error response
             chat_service.update_message_status(user_message.id, MessageStatus.ERROR)
             
-            logger.error(f"HealthCoachAI error: {ai_response.error}")
+            logger.error("HealthCoachAI error: %s", ai_response.error)
             
             if is_htmx:
                 # Return error message as HTML
@@ -198,7 +198,7 @@ async def _handle_regular_response(
         # Mark user message as error
         chat_service.update_message_status(user_message.id, MessageStatus.ERROR)
         
-        logger.error(f"HealthCoachAI integration error: {ai_error}")
+        logger.error("HealthCoachAI integration error: %s", ai_error)
         
         if is_htmx:
             # Return error message as HTML
@@ -351,11 +351,11 @@ async def _handle_streaming_response(
                         )
                         yield chunk_event.to_sse_format()
                         
-                        # Small delay to prevent overwhelming the client
-                        await asyncio.sleep(0.01)
+                        # Yield to the event loop between chunks (no timer needed)
+                        await asyncio.sleep(0)
             
         except Exception as e:
-            logger.error(f"Streaming error: {e}")
+            logger.error("Streaming error: %s", e)
             
             # Mark user message as error if it exists
             if user_message:
@@ -403,7 +403,7 @@ async def get_chat_history(
         HTML response for htmx or JSON for API clients
     """
     try:
-        logger.info(f"Getting chat history for user {user_session.user_info.user_id}")
+        logger.info("Getting chat history for user %s", user_session.user_info.user_id)
         
         # Check if this is an htmx request
         is_htmx = request.headers.get("HX-Request") == "true"
@@ -429,7 +429,7 @@ async def get_chat_history(
             session_id=chat_session_id
         )
         
-        logger.info(f"Retrieved {len(messages)} messages for user {user_session.user_info.user_id}")
+        logger.info("Retrieved %s messages for user %s", len(messages), user_session.user_info.user_id)
         
         if is_htmx:
             # Return HTML for htmx
@@ -452,7 +452,7 @@ async def get_chat_history(
             )
         
     except Exception as e:
-        logger.error(f"Get chat history error: {e}")
+        logger.error("Get chat history error: %s", e)
         if request.headers.get("HX-Request") == "true":
             # Return error as HTML for htmx
             return HTMLResponse(
@@ -482,14 +482,14 @@ async def clear_chat_history(
         Success response
     """
     try:
-        logger.info(f"Clearing chat history for user {user_session.user_info.user_id}")
+        logger.info("Clearing chat history for user %s", user_session.user_info.user_id)
         
         chat_service = get_chat_service()
         
         if session_id:
-            logger.info(f"Clearing session {session_id} for user {user_session.user_info.user_id}")
+            logger.info("Clearing session %s for user %s", session_id, user_session.user_info.user_id)
         else:
-            logger.info(f"Clearing all history for user {user_session.user_info.user_id}")
+            logger.info("Clearing all history for user %s", user_session.user_info.user_id)
         
         return {
             "success": True,
@@ -497,7 +497,7 @@ async def clear_chat_history(
         }
         
     except Exception as e:
-        logger.error(f"Clear chat history error: {e}")
+        logger.error("Clear chat history error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
@@ -518,7 +518,7 @@ async def get_chat_sessions(
         List of chat sessions
     """
     try:
-        logger.info(f"Getting chat sessions for user {user_session.user_info.user_id}")
+        logger.info("Getting chat sessions for user %s", user_session.user_info.user_id)
         
         return {
             "success": True,
@@ -527,7 +527,7 @@ async def get_chat_sessions(
         }
         
     except Exception as e:
-        logger.error(f"Get chat sessions error: {e}")
+        logger.error("Get chat sessions error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
@@ -70,8 +70,8 @@ class CognitoAuthClient:
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
             
-            logger.debug(f"Making token request to: {self.config['token_url']}")
-            logger.debug(f"Token data: {token_data}")
+            logger.debug("Making token request to: %s", self.config['token_url'])
+            logger.debug("Token data: %s", token_data)
             
             # Make token request
             response = await self.http_client.post(
@@ -80,11 +80,11 @@ class CognitoAuthClient:
                 headers=headers
             )
             
-            logger.debug(f"Token response status: {response.status_code}")
+            logger.debug("Token response status: %s", response.status_code)
             
             if response.status_code != 200:
                 error_text = response.text
-                logger.error(f"Token exchange failed with status {response.status_code}: {error_text}")
+                logger.error("Token exchange failed with status %s: %s", response.status_code, error_text)
                 
                 try:
                     error_data = response.json()
@@ -95,7 +95,7 @@ class CognitoAuthClient:
                 raise Exception(error_msg)
             
             token_response = response.json()
-            logger.debug(f"Token response: {list(token_response.keys())}")  # Log keys only for security
+            logger.debug("Token response: %s", list(token_response.keys()))  # Log keys only for security
             
             # Calculate expiration time
             expires_in = token_response.get('expires_in', 3600)
@@ -115,7 +115,7 @@ class CognitoAuthClient:
             return tokens
             
         except Exception as e:
-            logger.error(f"Failed to exchange authorization code for tokens: {e}")
+            logger.error("Failed to exchange authorization code for tokens: %s", e)
             raise
     
     async def refresh_tokens(self, refresh_token: str) -> CognitoTokens:
@@ -153,7 +153,7 @@ class CognitoAuthClient:
             
             if response.status_code != 200:
                 error_text = response.text
-                logger.error(f"Token refresh failed with status {response.status_code}: {error_text}")
+                logger.error("Token refresh failed with status %s: %s", response.status_code, error_text)
                 
                 try:
                     error_data = response.json()
@@ -183,7 +183,7 @@ class CognitoAuthClient:
             return tokens
             
         except Exception as e:
-            logger.error(f"Failed to refresh tokens: {e}")
+            logger.error("Failed to refresh tokens: %s", e)
             raise
     
     async def get_user_info(self, access_token: str) -> UserInfo:
@@ -216,11 +216,11 @@ class CognitoAuthClient:
             # Create UserInfo object
             user_info = UserInfo(**user_data)
             
-            logger.info(f"Successfully retrieved user info for user: {user_info.user_id}")
+            logger.info("Successfully retrieved user info for user: %s", user_info.user_id)
             return user_info
             
         except Exception as e:
-            logger.error(f"Failed to get user info: {e}")
+            logger.error("Failed to get user info: %s", e)
             raise
     
     async def verify_jwt_token(self, token: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
@@ -253,7 +253,7 @@ class CognitoAuthClient:
                     break
             
             if not key:
-                logger.error(f"JWT key with kid '{kid}' not found in JWKS")
+                logger.error("JWT key with kid '%s' not found in JWKS", kid)
                 return False, None
             
             # Verify token
@@ -271,14 +271,14 @@ class CognitoAuthClient:
                 logger.error("JWT token has expired")
                 return False, None
             
-            logger.debug(f"JWT token verified successfully for user: {payload.get('sub')}")
+            logger.debug("JWT token verified successfully for user: %s", payload.get('sub'))
             return True, payload
             
         except JWTError as e:
-            logger.error(f"JWT verification failed: {e}")
+            logger.error("JWT verification failed: %s", e)
             return False, None
         except Exception as e:
-            logger.error(f"Unexpected error during JWT verification: {e}")
+            logger.error("Unexpected error during JWT verification: %s", e)
             return False, None
     
     async def _get_jwks(self) -> Dict[str, Any]:
@@ -310,7 +310,7 @@ class CognitoAuthClient:
             return jwks
             
         except Exception as e:
-            logger.error(f"Failed to fetch JWKS: {e}")
+            logger.error("Failed to fetch JWKS: %s", e)
             raise
     
     def decode_jwt_payload(self, token: str) -> Optional[Dict[str, Any]]:
@@ -341,7 +341,7 @@ class CognitoAuthClient:
             return payload_data
             
         except Exception as e:
-            logger.error(f"Failed to decode JWT payload: {e}")
+            logger.error("Failed to decode JWT payload: %s", e)
             return None
     
     async def logout_user(self, access_token: str) -> bool:
@@ -361,7 +361,7 @@ class CognitoAuthClient:
             return True
             
         except Exception as e:
-            logger.error(f"Logout failed: {e}")
+            logger.error("Logout failed: %s", e)
             return False
     
     async def close(self):
@@ -88,7 +88,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
         try:
             # Get Authorization header
             auth_header = request.headers.get('Authorization')
-            logger.debug(f"Authorization header: {auth_header[:50] if auth_header else 'None'}...")
+            logger.debug("Authorization header: %s...", auth_header[:50] if auth_header else 'None')
             
             if not auth_header or not auth_header.startswith('Bearer '):
                 logger.debug("No valid Authorization header found")
@@ -96,7 +96,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             
             # Extract JWT token
             jwt_token = auth_header[7:]  # Remove 'Bearer ' prefix
-            logger.debug(f"Extracted JWT token: {jwt_token[:50]}...")
+            logger.debug("Extracted JWT token: %s...", jwt_token[:50])
             
             # Create a temporary session from JWT
             from .cognito import get_cognito_client
@@ -108,7 +108,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             # For testing: decode JWT without verification
             logger.debug("Decoding JWT token for testing...")
             payload = cognito_client.decode_jwt_payload(jwt_token)
-            logger.debug(f"JWT decode result: payload={bool(payload)}")
+            logger.debug("JWT decode result: payload=%s", bool(payload))
             
             if not payload:
                 logger.warning("JWT token decode failed")
@@ -121,7 +121,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                 username=payload.get('username', payload.get('cognito:username', '')),
                 email_verified=payload.get('email_verified', False)
             )
-            logger.debug(f"Created UserInfo for user: {user_info.user_id}")
+            logger.debug("Created UserInfo for user: %s", user_info.user_id)
             
             # Create temporary tokens object
             tokens = CognitoTokens(
@@ -138,13 +138,13 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                 tokens=tokens
             )
             
-            logger.info(f"Successfully created session from JWT for user: {user_info.user_id}")
+            logger.info("Successfully created session from JWT for user: %s", user_info.user_id)
             return session
             
         except Exception as e:
-            logger.error(f"JWT session creation error: {e}")
+            logger.error("JWT session creation error: %s", e)
             import traceback
-            logger.error(f"JWT session creation traceback: {traceback.format_exc()}")
+            logger.error("JWT session creation traceback: %s", traceback.format_exc())
             return None
     
     async def dispatch(self, request: Request, call_next):
@@ -173,7 +173,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                 session = await self._get_session_from_jwt(request)
             
             if not session:
-                logger.info(f"Unauthenticated access to protected path: {path}")
+                logger.info("Unauthenticated access to protected path: %s", path)
                 
                 # For API endpoints, return 401
                 if path.startswith('/api/'):
@@ -198,7 +198,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             return response
             
         except Exception as e:
-            logger.error(f"Authentication middleware error: {e}")
+            logger.error("Authentication middleware error: %s", e)
             # Let the request continue and let the application handle the error
             return await call_next(request)
 
@@ -223,7 +223,7 @@ class SessionCleanupMiddleware(BaseHTTPMiddleware):
             # Clean up expired sessions periodically
             if self.request_count % self.cleanup_interval == 0:
                 logger.debug("Running session cleanup")
-                self.session_manager.cleanup_expired_sessions()
+                await self.session_manager.cleanup_expired_sessions()
             
             # Process request
             response = await call_next(request)
@@ -231,7 +231,7 @@ class SessionCleanupMiddleware(BaseHTTPMiddleware):
             return response
             
         except Exception as e:
-            logger.error(f"Session cleanup middleware error: {e}")
+            logger.error("Session cleanup middleware error: %s", e)
             return await call_next(request)
 
 
@@ -72,7 +72,7 @@ async def auth_callback_post(request: Request, response: Response):
         return result
         
     except Exception as e:
-        logger.error(f"POST callback failed: {e}")
+        logger.error("POST callback failed: %s", e)
         return JSONResponse(
             content={"success": False, "error": str(e)},
             status_code=500
@@ -95,7 +95,7 @@ async def _handle_auth_callback(
         # Check for OAuth errors
         if error:
             error_msg = error_description or error
-            logger.error(f"OAuth error: {error_msg}")
+            logger.error("OAuth error: %s", error_msg)
             return RedirectResponse(
                 url=f"/login?error={urllib.parse.quote(error_msg)}", 
                 status_code=302
@@ -125,12 +125,12 @@ async def _handle_auth_callback(
         redirect_response = RedirectResponse(url=redirect_url, status_code=302)
         session_manager.set_session_cookie(redirect_response, session_id)
         
-        logger.info(f"User {user_info.email} logged in successfully")
+        logger.info("User %s logged in successfully", user_info.email)
         
         return redirect_response
         
     except Exception as e:
-        logger.error(f"Authentication callback failed: {e}")
+        logger.error("Authentication callback failed: %s", e)
         error_msg = "Authentication failed. Please try again."
         return RedirectResponse(
             url=f"/login?error={urllib.parse.quote(error_msg)}", 
@@ -159,9 +159,9 @@ async def logout(request: Request, response: Response):
             try:
                 await cognito_client.logout_user(session.tokens.access_token)
             except Exception as e:
-                logger.warning(f"Cognito logout failed: {e}")
+                logger.warning("Cognito logout failed: %s", e)
             
-            logger.info(f"User {session.user_info.email} logged out")
+            logger.info("User %s logged out", session.user_info.email)
         
         # Clear session cookie
         session_manager.clear_session_cookie(response)
@@ -172,7 +172,7 @@ async def logout(request: Request, response: Response):
         )
         
     except Exception as e:
-        logger.error(f"Logout failed: {e}")
+        logger.error("Logout failed: %s", e)
         # Clear cookie anyway
         session_manager.clear_session_cookie(response)
         return JSONResponse(
@@ -190,7 +190,7 @@ async def auth_status(request: Request):
         return session_manager.get_auth_status(request)
         
     except Exception as e:
-        logger.error(f"Failed to get auth status: {e}")
+        logger.error("Failed to get auth status: %s", e)
         return AuthStatus(is_authenticated=False)
 
 
@@ -221,7 +221,7 @@ async def refresh_tokens(
         if session_id:
             session_manager.update_session_tokens(session_id, new_tokens)
         
-        logger.info(f"Tokens refreshed for user: {session.user_info.user_id}")
+        logger.info("Tokens refreshed for user: %s", session.user_info.user_id)
         
         return TokenRefreshResponse(
             success=True,
@@ -229,7 +229,7 @@ async def refresh_tokens(
         )
         
     except Exception as e:
-        logger.error(f"Token refresh failed: {e}")
+        logger.error("Token refresh failed: %s", e)
         return TokenRefreshResponse(
             success=False,
             error_message=str(e)
@@ -252,7 +252,7 @@ async def get_current_user_info(session: dict = require_authentication):
         }
         
     except Exception as e:
-        logger.error(f"Failed to get user info: {e}")
+        logger.error("Failed to get user info: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get user information"
@@ -302,7 +302,7 @@ async def demo_login(request: Request, response: Response):
         # Create session
         session_id = session_manager.create_session(demo_user, demo_tokens)
         
-        logger.info(f"Demo user logged in: {demo_user.email}")
+        logger.info("Demo user logged in: %s", demo_user.email)
         
         # Create JSON response
         json_response = JSONResponse(
@@ -316,7 +316,7 @@ async def demo_login(request: Request, response: Response):
         return json_response
         
     except Exception as e:
-        logger.error(f"Demo login failed: {e}")
+        logger.error("Demo login failed: %s", e)
         return JSONResponse(
             content={"success": False, "error": str(e)},
             status_code=500
@@ -348,7 +348,7 @@ async def verify_token(request: Request):
         }
         
     except Exception as e:
-        logger.error(f"Token verification failed: {e}")
+        logger.error("Token verification failed: %s", e)
         return {
             "valid": False,
             "error": str(e)
@@ -1,6 +1,7 @@
 """
 Session management for user authentication
 """
+import asyncio
 import json
 import secrets
 from typing import Optional, Dict, Any
@@ -27,7 +28,7 @@ class SessionManager:
         self.cookie_samesite = "lax"  # Lax allows cross-site requests
         
         # Debug: Log cookie configuration
-        logger.debug(f"SessionManager initialized: secure={self.cookie_secure}, httponly={self.cookie_httponly}, samesite={self.cookie_samesite}, debug={config.DEBUG}")
+        logger.debug("SessionManager initialized: secure=%s, httponly=%s, samesite=%s, debug=%s", self.cookie_secure, self.cookie_httponly, self.cookie_samesite, config.DEBUG)
         
         # In-memory session store (for development)
         # In production, this should be replaced with Redis or database
@@ -58,13 +59,13 @@ class SessionManager:
             # Store session
             self._sessions[session_id] = session
             
-            logger.info(f"Created session for user: {user_info.user_id}")
-            logger.debug(f"Session store now has {len(self._sessions)} sessions")
-            logger.debug(f"Session ID: {session_id}")
+            logger.info("Created session for user: %s", user_info.user_id)
+            logger.debug("Session store now has %s sessions", len(self._sessions))
+            logger.debug("Session ID: %s", session_id)
             return session_id
             
         except Exception as e:
-            logger.error(f"Failed to create session: {e}")
+            logger.error("Failed to create session: %s", e)
             raise
     
     def get_session(self, session_id: str) -> Optional[UserSession]:
@@ -85,7 +86,7 @@ class SessionManager:
             
             # Check if session is expired
             if session.is_expired():
-                logger.info(f"Session expired for user: {session.user_info.user_id}")
+                logger.info("Session expired for user: %s", session.user_info.user_id)
                 self.delete_session(session_id)
                 return None
             
@@ -95,7 +96,7 @@ class SessionManager:
             return session
             
         except Exception as e:
-            logger.error(f"Failed to get session: {e}")
+            logger.error("Failed to get session: %s", e)
             return None
     
     def update_session_tokens(self, session_id: str, tokens: CognitoTokens) -> bool:
@@ -119,11 +120,11 @@ class SessionManager:
             session.tokens = tokens
             session.update_last_accessed()
             
-            logger.info(f"Updated tokens for session: {session_id}")
+            logger.info("Updated tokens for session: %s", session_id)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to update session tokens: {e}")
+            logger.error("Failed to update session tokens: %s", e)
             return False
     
     def delete_session(self, session_id: str) -> bool:
@@ -140,13 +141,13 @@ class SessionManager:
             session = self._sessions.pop(session_id, None)
             
             if session:
-                logger.info(f"Deleted session for user: {session.user_info.user_id}")
+                logger.info("Deleted session for user: %s", session.user_info.user_id)
                 return True
             
             return False
             
         except Exception as e:
-            logger.error(f"Failed to delete session: {e}")
+            logger.error("Failed to delete session: %s", e)
             return False
     
     def set_session_cookie(self, response: Response, session_id: str):
@@ -159,8 +160,8 @@ class SessionManager:
         """
         try:
             # Debug: Log cookie settings
-            logger.debug(f"Setting cookie '{self.cookie_name}' with: secure={self.cookie_secure}, httponly={self.cookie_httponly}, samesite={self.cookie_samesite}, path='/'")
-            logger.debug(f"Session ID to set: {session_id}")
+            logger.debug("Setting cookie '%s' with: secure=%s, httponly=%s, samesite=%s, path='/'", self.cookie_name, self.cookie_secure, self.cookie_httponly, self.cookie_samesite)
+            logger.debug("Session ID to set: %s", session_id)
             
             # For development on localhost, use minimal cookie settings
             response.set_cookie(
@@ -174,10 +175,10 @@ class SessionManager:
                 domain=None      # Let browser determine domain
             )
             
-            logger.info(f"Set session cookie: {session_id[:20]}...")
+            logger.info("Set session cookie: %s...", session_id[:20])
             
         except Exception as e:
-            logger.error(f"Failed to set session cookie: {e}")
+            logger.error("Failed to set session cookie: %s", e)
             raise
     
     def get_session_from_request(self, request: Request) -> Optional[UserSession]:
@@ -193,28 +194,28 @@ class SessionManager:
         try:
             # Debug: Log all cookies
             all_cookies = dict(request.cookies)
-            logger.debug(f"All cookies in request: {list(all_cookies.keys())}")
+            logger.debug("All cookies in request: %s", list(all_cookies.keys()))
             
             session_id = request.cookies.get(self.cookie_name)
-            logger.debug(f"Looking for cookie '{self.cookie_name}': {session_id[:20] if session_id else 'None'}...")
+            logger.debug("Looking for cookie '%s': %s...", self.cookie_name, session_id[:20] if session_id else 'None')
             
             if not session_id:
-                logger.debug(f"No session cookie found")
+                logger.debug("No session cookie found")
                 return None
             
             # Debug: Log session store status
-            logger.debug(f"Session store has {len(self._sessions)} sessions")
+            logger.debug("Session store has %s sessions", len(self._sessions))
             
             session = self.get_session(session_id)
             if session:
-                logger.debug(f"Found session for user: {session.user_info.user_id}")
+                logger.debug("Found session for user: %s", session.user_info.user_id)
             else:
-                logger.debug(f"Session not found in store for ID: {session_id[:20]}...")
+                logger.debug("Session not found in store for ID: %s...", session_id[:20])
             
             return session
             
         except Exception as e:
-            logger.error(f"Failed to get session from request: {e}")
+            logger.error("Failed to get session from request: %s", e)
             return None
     
     def clear_session_cookie(self, response: Response):
@@ -236,27 +237,34 @@ class SessionManager:
             logger.debug("Cleared session cookie")
             
         except Exception as e:
-            logger.error(f"Failed to clear session cookie: {e}")
+            logger.error("Failed to clear session cookie: %s", e)
     
-    def cleanup_expired_sessions(self):
+    async def cleanup_expired_sessions(self, batch_size: int = 100):
         """
         Clean up expired sessions (should be called periodically)
+        
+        Removals are done in batches, yielding to the event loop between
+        batches so a mass expiry does not stall concurrent requests.
+        
+        Args:
+            batch_size: Number of sessions to delete before yielding
         """
         try:
-            expired_sessions = []
-            
-            for session_id, session in self._sessions.items():
-                if session.is_expired():
-                    expired_sessions.append(session_id)
+            expired_sessions = [
+                session_id for session_id, session in self._sessions.items()
+                if session.is_expired()
+            ]
             
-            for session_id in expired_sessions:
+            for i, session_id in enumerate(expired_sessions, 1):
                 self.delete_session(session_id)
+                if i % batch_size == 0:
+                    await asyncio.sleep(0)
             
             if expired_sessions:
-                logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
+                logger.info("Cleaned up %s expired sessions", len(expired_sessions))
                 
         except Exception as e:
-            logger.error(f"Failed to cleanup expired sessions: {e}")
+            logger.error("Failed to cleanup expired sessions: %s", e)
     
     def get_auth_status(self, request: Request) -> AuthStatus:
         """
@@ -282,7 +290,7 @@ class SessionManager:
             )
             
         except Exception as e:
-            logger.error(f"Failed to get auth status: {e}")
+            logger.error("Failed to get auth status: %s", e)
             return AuthStatus(is_authenticated=False)
 
 
@@ -319,7 +327,7 @@ async def require_authentication(request: Request) -> UserSession:
         session = await _get_session_from_jwt(request)
     
     if not session:
-        logger.warning(f"Authentication failed for {request.url.path}")
+        logger.warning("Authentication failed for %s", request.url.path)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication required",
@@ -334,7 +342,7 @@ async def _get_session_from_jwt(request: Request):
     try:
         # Get Authorization header
         auth_header = request.headers.get('Authorization')
-        logger.debug(f"Authorization header: {auth_header[:50] if auth_header else 'None'}...")
+        logger.debug("Authorization header: %s...", auth_header[:50] if auth_header else 'None')
         
         if not auth_header or not auth_header.startswith('Bearer '):
             logger.debug("No valid Authorization header found")
@@ -342,7 +350,7 @@ async def _get_session_from_jwt(request: Request):
         
         # Extract JWT token
         jwt_token = auth_header[7:]  # Remove 'Bearer ' prefix
-        logger.debug(f"Extracted JWT token: {jwt_token[:50]}...")
+        logger.debug("Extracted JWT token: %s...", jwt_token[:50])
         
         # Import here to avoid circular imports
         from .cognito import get_cognito_client
@@ -354,7 +362,7 @@ async def _get_session_from_jwt(request: Request):
         # For testing: decode JWT without verification
         logger.debug("Decoding JWT token for testing...")
         payload = cognito_client.decode_jwt_payload(jwt_token)
-        logger.debug(f"JWT decode result: payload={bool(payload)}")
+        logger.debug("JWT decode result: payload=%s", bool(payload))
         
         if not payload:
             logger.warning("JWT token decode failed")
@@ -367,7 +375,7 @@ async def _get_session_from_jwt(request: Request):
             username=payload.get('username', payload.get('cognito:username', '')),
             email_verified=payload.get('email_verified', False)
         )
-        logger.debug(f"Created UserInfo for user: {user_info.user_id}")
+        logger.debug("Created UserInfo for user: %s", user_info.user_id)
         
         # Create temporary tokens object
         tokens = CognitoTokens(
@@ -384,13 +392,13 @@ async def _get_session_from_jwt(request: Request):
             tokens=tokens
         )
         
-        logger.info(f"Successfully created session from JWT for user: {user_info.user_id}")
+        logger.info("Successfully created session from JWT for user: %s", user_info.user_id)
         return session
         
     except Exception as e:
-        logger.error(f"JWT session creation error: {e}")
+        logger.error("JWT session creation error: %s", e)
         import traceback
-        logger.error(f"JWT session creation traceback: {traceback.format_exc()}")
+        logger.error("JWT session creation traceback: %s", traceback.format_exc())
         return None
 
 
@@ -411,7 +419,7 @@ def get_current_user(request: Request) -> Optional[UserSession]:
         session = session_manager.get_session_from_request(request)
         
         if session:
-            logger.debug(f"Found session from cookie for user: {session.user_info.user_id}")
+            logger.debug("Found session from cookie for user: %s", session.user_info.user_id)
             return session
         
         # If no session from cookie, try JWT from Authorization header
@@ -431,5 +439,5 @@ def get_current_user(request: Request) -> Optional[UserSession]:
         return None
         
     except Exception as e:
-        logger.error(f"Error in get_current_user: {e}")
+        logger.error("Error in get_current_user: %s", e)
         return None
\ No newline at end of file
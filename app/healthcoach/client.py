@@ -36,7 +36,7 @@ class HealthCoachClient:
         escaped_agent_arn = urllib.parse.quote(self.agent_arn, safe='')
         self.endpoint_url = f"https://bedrock-agentcore.{self.config.AWS_REGION}.amazonaws.com/runtimes/{escaped_agent_arn}/invocations?qualifier=DEFAULT"
         
-        logger.info(f"HealthCoachAI client initialized with endpoint: {self.endpoint_url}")
+        logger.info("HealthCoachAI client initialized with endpoint: %s", self.endpoint_url)
     
     def _extract_user_id_from_jwt(self, jwt_token: str) -> Optional[str]:
         """
@@ -57,14 +57,14 @@ class HealthCoachClient:
             
             if payload and 'sub' in payload:
                 user_id = payload['sub']
-                logger.debug(f"Successfully extracted user ID from JWT: {user_id}")
+                logger.debug("Successfully extracted user ID from JWT: %s", user_id)
                 return user_id
             else:
                 logger.warning("JWT token payload missing 'sub' field")
                 return None
                 
         except Exception as e:
-            logger.error(f"Failed to extract user ID from JWT token: {e}")
+            logger.error("Failed to extract user ID from JWT token: %s", e)
             return None
         
     async def send_message(
@@ -89,15 +89,15 @@ class HealthCoachClient:
             ChatResponse with complete message
         """
         try:
-            logger.info(f"Sending message to HealthCoachAI: {message[:100]}...")
+            logger.info("Sending message to HealthCoachAI: %s...", message[:100])
             
             # Extract session ID from session_attributes
             session_id = None
             if session_attributes and "session_id" in session_attributes:
                 session_id = session_attributes["session_id"]
-                logger.debug(f"Using session ID: {session_id}")
+                logger.debug("Using session ID: %s", session_id)
             else:
-                logger.debug(f"No session ID found in session_attributes: {session_attributes}")
+                logger.debug("No session ID found in session_attributes: %s", session_attributes)
             
             # Create optimized payload (avoid duplication - AgentCorePayload.to_json_payload() handles the structure)
             payload = AgentCorePayload(
@@ -125,14 +125,14 @@ class HealthCoachClient:
                     }
                 )
             else:
-                logger.error(f"HealthCoachAI error: {result['error']}")
+                logger.error("HealthCoachAI error: %s", result['error'])
                 return ChatResponse(
                     success=False,
                     error=result["error"]
                 )
                 
         except Exception as e:
-            logger.error(f"HealthCoachAI client error: {e}")
+            logger.error("HealthCoachAI client error: %s", e)
             return ChatResponse(
                 success=False,
                 error=f"Internal error: {str(e)}"
@@ -160,15 +160,15 @@ class HealthCoachClient:
             StreamingChunk objects with text chunks
         """
         try:
-            logger.info(f"Sending streaming message to HealthCoachAI: {message[:100]}...")
+            logger.info("Sending streaming message to HealthCoachAI: %s...", message[:100])
             
             # Extract session ID from session_attributes
             session_id = None
             if session_attributes and "session_id" in session_attributes:
                 session_id = session_attributes["session_id"]
-                logger.debug(f"Using session ID for streaming: {session_id}")
+                logger.debug("Using session ID for streaming: %s", session_id)
             else:
-                logger.debug(f"No session ID found in session_attributes: {session_attributes}")
+                logger.debug("No session ID found in session_attributes: %s", session_attributes)
             
             # Create optimized payload (avoid duplication - AgentCorePayload.to_json_payload() handles the structure)
             payload = AgentCorePayload(
@@ -187,7 +187,7 @@ class HealthCoachClient:
                 yield chunk
                 
         except Exception as e:
-            logger.error(f"HealthCoachAI streaming error: {e}")
+            logger.error("HealthCoachAI streaming error: %s", e)
             yield StreamingChunk(
                 text="",
                 is_complete=True,
@@ -205,7 +205,7 @@ class HealthCoachClient:
             Dict with success status and response/error
         """
         try:
-            logger.debug(f"AgentCore API payload: {json.dumps(payload)}")
+            logger.debug("AgentCore API payload: %s", json.dumps(payload))
             
             # Extract JWT token and session ID from payload
             session_attrs = payload.get('sessionState', {}).get('sessionAttributes', {})
@@ -222,9 +222,9 @@ class HealthCoachClient:
             if not session_id:
                 import uuid
                 session_id = f'healthmate-session-{uuid.uuid4().hex}'
-                logger.debug(f"Generated new session ID: {session_id}")
+                logger.debug("Generated new session ID: %s", session_id)
             else:
-                logger.debug(f"Using existing session ID: {session_id}")
+                logger.debug("Using existing session ID: %s", session_id)
             
             # Prepare headers for JWT authentication
             headers = {
@@ -297,13 +297,13 @@ class HealthCoachClient:
                 "error": "Request timeout - HealthCoachAI did not respond in time"
             }
         except httpx.RequestError as e:
-            logger.error(f"AgentCore API request error: {e}")
+            logger.error("AgentCore API request error: %s", e)
             return {
                 "success": False,
                 "error": f"Network error: {str(e)}"
             }
         except Exception as e:
-            logger.error(f"AgentCore API call error: {e}")
+            logger.error("AgentCore API call error: %s", e)
             return {
                 "success": False,
                 "error": f"API execution error: {str(e)}"
@@ -323,7 +323,7 @@ class HealthCoachClient:
             StreamingChunk objects with text chunks
         """
         try:
-            logger.debug(f"AgentCore API streaming payload: {json.dumps(payload)}")
+            logger.debug("AgentCore API streaming payload: %s", json.dumps(payload))
             
             # Extract JWT token and session ID from payload
             session_attrs = payload.get('sessionState', {}).get('sessionAttributes', {})
@@ -342,9 +342,9 @@ class HealthCoachClient:
             if not session_id:
                 import uuid
                 session_id = f'healthmate-session-{uuid.uuid4().hex}'
-                logger.debug(f"Generated new session ID for streaming: {session_id}")
+                logger.debug("Generated new session ID for streaming: %s", session_id)
             else:
-                logger.debug(f"Using existing session ID for streaming: {session_id}")
+                logger.debug("Using existing session ID for streaming: %s", session_id)
             
             # Prepare headers for JWT authentication
             headers = {
@@ -390,6 +390,11 @@ class HealthCoachClient:
                     async for chunk in response.aiter_text():
                         buffer += chunk
                         
+                        # Text deltas found in this network read are coalesced
+                        # into a single chunk so bursts of tokens cost one
+                        # downstream SSE event instead of one per token
+                        pending_text = []
+                        
                         # Process complete lines
                         while '\n' in buffer:
                             line, buffer = buffer.split('\n', 1)
@@ -405,16 +410,19 @@ class HealthCoachClient:
                                             delta = event_data['event']['contentBlockDelta'].get('delta', {})
                                             if 'text' in delta:
                                                 text_chunk = delta['text']
-                                                logger.debug(f"Streaming text chunk: {text_chunk}")
-                                                yield StreamingChunk(
-                                                    text=text_chunk,
-                                                    is_complete=False
-                                                )
+                                                logger.debug("Streaming text chunk: %s", text_chunk)
+                                                pending_text.append(text_chunk)
                                         else:
                                             # Log other event types for debugging
-                                            logger.debug(f"Streaming event: {event_data}")
+                                            logger.debug("Streaming event: %s", event_data)
                                 except json.JSONDecodeError:
                                     continue
+                        
+                        if pending_text:
+                            yield StreamingChunk(
+                                text="".join(pending_text),
+                                is_complete=False
+                            )
                     
                     # Send completion chunk
                     yield StreamingChunk(
@@ -430,14 +438,14 @@ class HealthCoachClient:
                 error="Request timeout - HealthCoachAI did not respond in time"
             )
         except httpx.RequestError as e:
-            logger.error(f"AgentCore API streaming request error: {e}")
+            logger.error("AgentCore API streaming request error: %s", e)
             yield StreamingChunk(
                 text="",
                 is_complete=True,
                 error=f"Network error: {str(e)}"
             )
         except Exception as e:
-            logger.error(f"AgentCore API streaming error: {e}")
+            logger.error("AgentCore API streaming error: %s", e)
             yield StreamingChunk(
                 text="",
                 is_complete=True,
@@ -33,7 +33,7 @@ async def send_chat_message(
         ChatResponse with AI response
     """
     try:
-        logger.info(f"Chat request from user {user_session.user_info.user_id}: {request.message[:100]}...")
+        logger.info("Chat request from user %s: %s...", user_session.user_info.user_id, request.message[:100])
         
         # Get HealthCoachAI client
         client = get_healthcoach_client()
@@ -47,11 +47,11 @@ async def send_chat_message(
             session_attributes=request.session_attributes
         )
         
-        logger.info(f"HealthCoachAI response success: {response.success}")
+        logger.info("HealthCoachAI response success: %s", response.success)
         return response
         
     except Exception as e:
-        logger.error(f"Chat endpoint error: {e}")
+        logger.error("Chat endpoint error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
@@ -74,7 +74,7 @@ async def send_chat_message_streaming(
         Streaming response with Server-Sent Events
     """
     try:
-        logger.info(f"Streaming chat request from user {user_session.user_info.user_id}: {request.message[:100]}...")
+        logger.info("Streaming chat request from user %s: %s...", user_session.user_info.user_id, request.message[:100])
         
         # Get HealthCoachAI client
         client = get_healthcoach_client()
@@ -105,11 +105,11 @@ async def send_chat_message_streaming(
                         # Send text chunk
                         yield f"data: {json.dumps({'type': 'chunk', 'text': chunk.text})}\n\n"
                         
-                        # Small delay to prevent overwhelming the client
-                        await asyncio.sleep(0.01)
+                        # Yield to the event loop between chunks (no timer needed)
+                        await asyncio.sleep(0)
                 
             except Exception as e:
-                logger.error(f"SSE stream error: {e}")
+                logger.error("SSE stream error: %s", e)
                 yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
         
         return FastAPIStreamingResponse(
@@ -124,7 +124,7 @@ async def send_chat_message_streaming(
         )
         
     except Exception as e:
-        logger.error(f"Streaming chat endpoint error: {e}")
+        logger.error("Streaming chat endpoint error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
@@ -156,7 +156,7 @@ async def healthcoach_status(
         }
         
     except Exception as e:
-        logger.error(f"Status endpoint error: {e}")
+        logger.error("Status endpoint error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
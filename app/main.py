@@ -28,10 +28,10 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     logger.info("HealthmateUI application starting up...")
-    logger.info(f"Environment: {config.__class__.__name__}")
-    logger.info(f"Debug mode: {config.DEBUG}")
-    logger.info(f"Cognito User Pool: {config.COGNITO_USER_POOL_ID}")
-    logger.info(f"HealthCoachAI Runtime: {config.HEALTH_COACH_AI_RUNTIME_ID}")
+    logger.info("Environment: %s", config.__class__.__name__)
+    logger.info("Debug mode: %s", config.DEBUG)
+    logger.info("Cognito User Pool: %s", config.COGNITO_USER_POOL_ID)
+    logger.info("HealthCoachAI Runtime: %s", config.HEALTH_COACH_AI_RUNTIME_ID)
     
     yield
     
@@ -177,7 +177,7 @@ async def not_found_handler(request: Request, exc: HTTPException):
 @app.exception_handler(500)
 async def internal_error_handler(request: Request, exc: HTTPException):
     """Custom 500 handler"""
-    logger.error(f"Internal server error: {exc}")
+    logger.error("Internal server error: %s", exc)
     return templates.TemplateResponse(
         "error.html",
         {
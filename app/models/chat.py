@@ -9,6 +9,8 @@ from enum import Enum
 import html
 import re
 
+from ..utils.serialization import json_dumps
+
 
 class MessageRole(str, Enum):
     """Message role enumeration"""
@@ -183,10 +185,8 @@ class StreamingEvent(BaseModel):
     error: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.now)
     
-    def to_sse_format(self) -> str:
-        """Convert to Server-Sent Events format"""
-        import json
-        
+    def to_sse_format(self) -> bytes:
+        """Convert to a Server-Sent Events frame, encoded for the wire"""
         event_data = {
             "event_type": self.event_type,
             "timestamp": self.timestamp.isoformat()
@@ -199,7 +199,11 @@ class StreamingEvent(BaseModel):
         if self.error:
             event_data["error"] = self.error
         
-        return f"data: {json.dumps(event_data)}\n\n"
+        return b"data: " + json_dumps(event_data) + b"\n\n"
+    
+    def to_sse_str(self) -> str:
+        """Server-Sent Events frame as text (for logging and display)"""
+        return self.to_sse_format().decode()
     
     class Config:
         json_encoders = {
@@ -2,7 +2,7 @@
 Chat service for managing chat history and sessions
 Simplified in-memory implementation for development
 """
-import uuid
+import secrets
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -19,8 +19,11 @@ class ChatService:
     
     def __init__(self):
         """Initialize chat service with in-memory storage"""
-        self._chat_histories: Dict[str, ChatHistory] = {}
+        # Histories indexed per user, then by session ID
+        self._chat_histories: Dict[str, Dict[str, ChatHistory]] = {}
         self._chat_sessions: Dict[str, ChatSession] = {}
+        # Running per-user message totals so counting never scans histories
+        self._user_message_counts: Dict[str, int] = {}
         
     def get_or_create_session(self, user_id: str, session_id: Optional[str] = None) -> ChatSession:
         """
@@ -41,7 +44,7 @@ class ChatService:
                 return session
         
         # Create new session
-        new_session_id = session_id or str(uuid.uuid4())
+        new_session_id = session_id or secrets.token_hex(16)
         session = ChatSession(
             session_id=new_session_id,
             user_id=user_id
@@ -49,14 +52,17 @@ class ChatService:
         
         self._chat_sessions[new_session_id] = session
         
-        # Initialize chat history
-        history_key = f"{user_id}:{new_session_id}"
-        self._chat_histories[history_key] = ChatHistory(
+        # Initialize chat history, dropping any replaced history from the user's total
+        user_histories = self._chat_histories.setdefault(user_id, {})
+        replaced = user_histories.get(new_session_id)
+        if replaced and replaced.messages:
+            self._user_message_counts[user_id] -= len(replaced.messages)
+        user_histories[new_session_id] = ChatHistory(
             user_id=user_id,
             session_id=new_session_id
         )
         
-        logger.info(f"Created chat session {new_session_id} for user {user_id}")
+        logger.info("Created chat session %s for user %s", new_session_id, user_id)
         return session
     
     def add_message(
@@ -85,7 +91,7 @@ class ChatService:
         
         # Create message
         message = ChatMessage(
-            id=str(uuid.uuid4()),
+            id=secrets.token_hex(16),
             role=role,
             content=content,
             user_id=user_id,
@@ -94,15 +100,15 @@ class ChatService:
         )
         
         # Add to history
-        history_key = f"{user_id}:{session.session_id}"
-        history = self._chat_histories[history_key]
+        history = self._chat_histories[user_id][session.session_id]
         history.add_message(message)
         
-        # Update session
+        # Update session and running user total
         session.message_count += 1
+        self._user_message_counts[user_id] = self._user_message_counts.get(user_id, 0) + 1
         session.update_activity()
         
-        logger.info(f"Added {role} message to session {session.session_id}")
+        logger.info("Added %s message to session %s", role, session.session_id)
         return message
     
     def get_chat_history(
@@ -124,17 +130,17 @@ class ChatService:
         Returns:
             List[ChatMessage]: Chat messages
         """
+        user_histories = self._chat_histories.get(user_id, {})
+        
         if session_id:
             # Get history for specific session
-            history_key = f"{user_id}:{session_id}"
-            history = self._chat_histories.get(history_key)
+            history = user_histories.get(session_id)
             messages = history.messages if history else []
         else:
             # Get history across all sessions for user
             messages = []
-            for key, history in self._chat_histories.items():
-                if key.startswith(f"{user_id}:"):
-                    messages.extend(history.messages)
+            for history in user_histories.values():
+                messages.extend(history.messages)
             
             # Sort by timestamp
             messages.sort(key=lambda m: m.timestamp)
@@ -154,16 +160,11 @@ class ChatService:
             int: Total message count
         """
         if session_id:
-            history_key = f"{user_id}:{session_id}"
-            history = self._chat_histories.get(history_key)
+            history = self._chat_histories.get(user_id, {}).get(session_id)
             return history.total_count if history else 0
         
-        # Count across all sessions
-        total = 0
-        for key, history in self._chat_histories.items():
-            if key.startswith(f"{user_id}:"):
-                total += history.total_count
-        return total
+        # Count across all sessions (maintained incrementally in add_message)
+        return self._user_message_counts.get(user_id, 0)
     
     def update_message_status(self, message_id: str, status: MessageStatus) -> bool:
         """
@@ -176,14 +177,15 @@ class ChatService:
         Returns:
             bool: True if updated successfully
         """
-        for history in self._chat_histories.values():
-            for message in history.messages:
-                if message.id == message_id:
-                    message.status = status
-                    logger.info(f"Updated message {message_id} status to {status}")
-                    return True
-        
-        logger.warning(f"Message {message_id} not found")
+        for user_histories in self._chat_histories.values():
+            for history in user_histories.values():
+                for message in history.messages:
+                    if message.id == message_id:
+                        message.status = status
+                        logger.info("Updated message %s status to %s", message_id, status)
+                        return True
+        
+        logger.warning("Message %s not found", message_id)
         return False
 
 
@@ -1,38 +1,42 @@
 """
 Configuration management for HealthmateUI
 """
+import functools
 import os
 from typing import Dict, Any
 
+from .env import env_flag
+
+# Read the process environment through one local mapping
+_env = os.environ
+
+# Config attributes that must be set for the application to run
+_REQUIRED = (
+    "AWS_ACCOUNT_ID",
+    "COGNITO_USER_POOL_ID",
+    "COGNITO_CLIENT_ID",
+    "HEALTH_COACH_AI_RUNTIME_ID",
+)
+
 
 class Config:
     """Application configuration"""
     
     # AWS Configuration
-    AWS_REGION = os.getenv("AWS_REGION", "us-west-2")
-    AWS_ACCOUNT_ID = os.getenv("AWS_ACCOUNT_ID")  # Required - no default
+    AWS_REGION = _env.get("AWS_REGION", "us-west-2")
+    AWS_ACCOUNT_ID = _env.get("AWS_ACCOUNT_ID")  # Required - no default
     
     # Cognito Configuration (from HealthManagerMCP stack)
-    COGNITO_USER_POOL_ID = os.getenv("COGNITO_USER_POOL_ID")  # Required - no default
-    COGNITO_CLIENT_ID = os.getenv("COGNITO_CLIENT_ID")  # Required - no default
+    COGNITO_USER_POOL_ID = _env.get("COGNITO_USER_POOL_ID")  # Required - no default
+    COGNITO_CLIENT_ID = _env.get("COGNITO_CLIENT_ID")  # Required - no default
     # COGNITO_CLIENT_SECRET - Not needed for public client (no secret)
     
     # HealthCoachAI Configuration
-    HEALTH_COACH_AI_RUNTIME_ID = os.getenv("HEALTH_COACH_AI_RUNTIME_ID")  # Required - no default
+    HEALTH_COACH_AI_RUNTIME_ID = _env.get("HEALTH_COACH_AI_RUNTIME_ID")  # Required - no default
     
     def validate_required_config(self):
         """Validate that all required configuration is present"""
-        required_vars = [
-            ("AWS_ACCOUNT_ID", self.AWS_ACCOUNT_ID),
-            ("COGNITO_USER_POOL_ID", self.COGNITO_USER_POOL_ID),
-            ("COGNITO_CLIENT_ID", self.COGNITO_CLIENT_ID),
-            ("HEALTH_COACH_AI_RUNTIME_ID", self.HEALTH_COACH_AI_RUNTIME_ID),
-        ]
-        
-        missing_vars = []
-        for var_name, var_value in required_vars:
-            if not var_value:
-                missing_vars.append(var_name)
+        missing_vars = [name for name in _REQUIRED if not getattr(self, name)]
         
         if missing_vars:
             raise ValueError(
@@ -43,12 +47,12 @@ class Config:
         return True
     
     # Application Configuration
-    SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
-    DEBUG = os.getenv("DEBUG", "True").lower() == "true"
+    SECRET_KEY = _env.get("SECRET_KEY", "dev-secret-key-change-in-production")
+    DEBUG = env_flag("DEBUG", "True")
     
     # Callback URLs (will be updated when deployed)
-    CALLBACK_URL = os.getenv("CALLBACK_URL", "http://localhost:8000/auth/callback")
-    LOGOUT_URL = os.getenv("LOGOUT_URL", "http://localhost:8000/auth/logout")
+    CALLBACK_URL = _env.get("CALLBACK_URL", "http://localhost:8000/auth/callback")
+    LOGOUT_URL = _env.get("LOGOUT_URL", "http://localhost:8000/auth/logout")
     
     @property
     def COGNITO_DOMAIN(self) -> str:
@@ -117,16 +121,17 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     """Production environment configuration"""
     DEBUG = False
-    SECRET_KEY = os.getenv("SECRET_KEY")  # Must be set in production
+    SECRET_KEY = _env.get("SECRET_KEY")  # Must be set in production
     
     # Production URLs will be set via environment variables
-    CALLBACK_URL = os.getenv("CALLBACK_URL")
-    LOGOUT_URL = os.getenv("LOGOUT_URL")
+    CALLBACK_URL = _env.get("CALLBACK_URL")
+    LOGOUT_URL = _env.get("LOGOUT_URL")
 
 
+@functools.lru_cache(maxsize=1)
 def get_config() -> Config:
-    """Get configuration based on environment"""
-    env = os.getenv("ENVIRONMENT", "development").lower()
+    """Get configuration based on environment (built and validated once per process)"""
+    env = _env.get("ENVIRONMENT", "development").lower()
     
     if env == "production":
         config = ProductionConfig()
@@ -0,0 +1,15 @@
+"""
+Environment variable helpers for HealthmateUI
+
+Kept free of application imports so startup and test scripts can use them
+before the environment is fully populated.
+"""
+import os
+
+# Accepted spellings for boolean flags
+_TRUTHY = frozenset({"true", "1", "yes", "on"})
+
+
+def env_flag(name: str, default: str = "") -> bool:
+    """True when the environment variable holds one of the accepted truthy spellings"""
+    return os.environ.get(name, default).casefold() in _TRUTHY
@@ -1,6 +1,7 @@
 """
 Logging configuration for HealthmateUI
 """
+import functools
 import logging
 import sys
 from typing import Optional
@@ -8,7 +9,20 @@ from .config import get_config
 
 config = get_config()
 
+# Log level based on environment
+_LOG_LEVEL = logging.DEBUG if config.DEBUG else logging.INFO
 
+# Single console handler/formatter shared by every application logger
+_HANDLER = logging.StreamHandler(sys.stdout)
+_HANDLER.setLevel(_LOG_LEVEL)
+_HANDLER.setFormatter(logging.Formatter(
+    fmt='{asctime} - {name} - {levelname} - {message}',
+    datefmt='%Y-%m-%d %H:%M:%S',
+    style='{'
+))
+
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Setup logger with appropriate configuration
@@ -25,23 +39,10 @@ def setup_logger(name: Optional[str] = None) -> logging.Logger:
     if logger.handlers:
         return logger
     
-    # Set log level based on environment
-    log_level = logging.DEBUG if config.DEBUG else logging.INFO
-    logger.setLevel(log_level)
-    
-    # Create console handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(log_level)
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
+    logger.setLevel(_LOG_LEVEL)
     
-    # Add handler to logger
-    logger.addHandler(handler)
+    # Attach the shared console handler
+    logger.addHandler(_HANDLER)
     
     # Prevent propagation to root logger
     logger.propagate = False
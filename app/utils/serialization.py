@@ -0,0 +1,12 @@
+"""
+JSON serialisation helpers for HealthmateUI
+"""
+import json
+
+try:
+    # orjson serialises straight to compact UTF-8 bytes
+    from orjson import dumps as json_dumps
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        """Serialise obj to compact UTF-8 JSON bytes, matching orjson's output"""
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
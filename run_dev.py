@@ -6,28 +6,188 @@ Dynamically loads configuration from AWS services
 import uvicorn
 import sys
 import os
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
+import compileall
+import functools
+import importlib.util
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from app.utils.env import env_flag
+
+# boto3/botocore are imported lazily: they are slow to import and not
+# needed at all when .env or the config cache already has every value
+
+
+@functools.lru_cache(maxsize=None)
+def _aws_client_config():
+    """Shared client settings: keepalive connections, bounded timeouts and
+    botocore's standard retry mode"""
+    from botocore.config import Config
+    
+    return Config(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=30,
+        retries={'max_attempts': 3, 'mode': 'standard'}
+    )
+
+# boto3 Session objects are not thread-safe; serialize client creation
+_CLIENT_LOCK = threading.Lock()
+
+
+def _create_client(session, service_name: str):
+    """Create a client from the shared boto3 session"""
+    with _CLIENT_LOCK:
+        return session.client(service_name, config=_aws_client_config())
+
+
+# CloudFormation stack outputs and the environment variables they populate
+_CF_OUTPUT_TO_ENV = {
+    'UserPoolId': 'COGNITO_USER_POOL_ID',
+    'UserPoolClientId': 'COGNITO_CLIENT_ID',
+    'HealthCoachAIRuntimeId': 'HEALTH_COACH_AI_RUNTIME_ID',
+    'AccountId': 'AWS_ACCOUNT_ID'
+}
+_CF_ENV_VARS = tuple(_CF_OUTPUT_TO_ENV.values())
+
+
+def _all_env_set(names) -> bool:
+    """True when every named environment variable has a non-empty value"""
+    return all(os.environ.get(name) for name in names)
+
+# Case-folded name fragments identifying the HealthCoach runtime in the
+# AgentCore API and CLI listings
+_RUNTIME_NEEDLES = ('healthmate_coach_ai',)
+_CLI_RUNTIME_NEEDLES = ('health_coach_ai',)
+
+# Resolved AWS settings are cached between dev-server restarts
+CONFIG_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "healthmate", "aws_config.json")
+CONFIG_CACHE_TTL = 3600  # 1 hour
+_CACHED_ENV_VARS = _CF_ENV_VARS
+
+
+def _cache_key(stack_name: str, region: str) -> str:
+    """Cache entry key: the stack and region, scoped to the AWS identity in use"""
+    # The account is only known after a lookup, so key on what selects it:
+    # the profile, or the access key when credentials come from the environment
+    identity = os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("AWS_PROFILE", "default")
+    return f"{identity}:{stack_name}:{region}"
+
+
+def load_cached_config(stack_name: str, region: str, cache_file: str = CONFIG_CACHE_FILE,
+                       refresh_env: str = "HEALTHMATE_REFRESH_CONFIG"):
+    """Return cached environment values for the stack, or None if missing/stale"""
+    if env_flag(refresh_env):
+        return None
+    
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            entry = json.load(f).get(_cache_key(stack_name, region))
+    except (OSError, ValueError):
+        return None
+    
+    if not entry or entry.get("saved_at", 0) + CONFIG_CACHE_TTL < time.time():
+        return None
+    return entry.get("values")
+
+
+def save_cached_config(stack_name: str, region: str, cache_file: str = CONFIG_CACHE_FILE,
+                       names=_CACHED_ENV_VARS, optional_names=()):
+    """
+    Cache the resolved environment values once all required ones are known
+    
+    The file may hold secrets (the e2e test caches the Cognito client
+    secret), so it is written owner-only. Raises OSError if it cannot be written.
+    """
+    if not _all_env_set(names):
+        return
+    values = {name: os.environ[name] for name in names + tuple(optional_names) if os.environ.get(name)}
+    
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    
+    cache[_cache_key(stack_name, region)] = {"saved_at": time.time(), "values": values}
+    
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_file = f"{cache_file}.tmp"
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.chmod(tmp_file, 0o600)
+    os.replace(tmp_file, cache_file)
+
 
 def load_aws_config():
     """Load AWS configuration dynamically from CloudFormation and AWS services"""
+    if env_flag("HEALTHMATE_SKIP_AWS_BOOTSTRAP"):
+        print("🔧 Skipping AWS bootstrap (HEALTHMATE_SKIP_AWS_BOOTSTRAP set)")
+        print()
+        return
+    
     print("🔧 Loading AWS configuration...")
     
+    if _all_env_set(_CACHED_ENV_VARS):
+        print("   ✅ All AWS variables already set; skipping AWS lookups")
+        print()
+        return
+    
+    region = os.getenv("AWS_REGION", "us-west-2")
+    stack_name = os.getenv("HEALTH_STACK_NAME", "Healthmate-CoreStack")
+    
+    cached = load_cached_config(stack_name, region)
+    if cached:
+        # Values already in the environment (e.g. from .env) take precedence
+        for env_var, value in cached.items():
+            os.environ.setdefault(env_var, value)
+        print(f"   ✅ Loaded {len(cached)} variables from cache: {CONFIG_CACHE_FILE}")
+        print()
+        return
+    
+    import boto3
+    from botocore.exceptions import NoCredentialsError
+    
     try:
-        region = os.getenv("AWS_REGION", "us-west-2")
-        
-        # Load from CloudFormation stack
-        _load_from_cloudformation(region)
+        # One session for every lookup: credentials are resolved once and
+        # the clients share its endpoint/credential caches
+        session = boto3.session.Session(region_name=region)
         
-        # Load AWS Account ID if not set
-        _load_aws_account_id(region)
+        # CloudFormation and AgentCore lookups are independent round trips,
+        # so run them on worker threads while STS runs inline. Workers
+        # buffer their messages and each buffer is printed as it completes.
+        # CloudFormation outputs always win: the other lookups only fill
+        # values that are still unset.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {}
+            for loader in (_load_from_cloudformation, _load_healthcoach_runtime_id):
+                output = []
+                futures[executor.submit(loader, session, output.append)] = output
+            
+            _load_aws_account_id(session)
+            
+            for future in as_completed(futures):
+                for line in futures[future]:
+                    print(line)
+                try:
+                    future.result()
+                except NoCredentialsError:
+                    print("   ⚠️  AWS credentials not configured. Run 'aws configure'")
+                except Exception as e:
+                    print(f"   ⚠️  AWS configuration error: {e}")
         
-        # Load HealthCoachAI Runtime ID if not set
-        _load_healthcoach_runtime_id(region)
+        try:
+            save_cached_config(stack_name, region)
+        except OSError as e:
+            print(f"   ⚠️  Could not write config cache: {e}")
         
     except NoCredentialsError:
         print("   ⚠️  AWS credentials not configured. Run 'aws configure'")
@@ -37,115 +197,144 @@ def load_aws_config():
     print()
 
 
-def _load_from_cloudformation(region: str):
+def _load_from_cloudformation(session, log=print):
     """Load configuration from CloudFormation stack"""
+    from botocore.exceptions import ClientError
+    
     stack_name = os.getenv("HEALTH_STACK_NAME", "Healthmate-CoreStack")
     
+    # Values from .env (or the shell) already cover every output we would read
+    if _all_env_set(_CF_ENV_VARS):
+        log("   ✅ All CloudFormation-derived variables already set; skipping describe_stacks")
+        return
+    
     try:
-        cf_client = boto3.client('cloudformation', region_name=region)
+        cf_client = _create_client(session, 'cloudformation')
         response = cf_client.describe_stacks(StackName=stack_name)
         stack = response['Stacks'][0]
-        outputs = {output['OutputKey']: output['OutputValue'] for output in stack.get('Outputs', [])}
-        
-        # Map CloudFormation outputs to environment variables
-        config_mapping = {
-            'UserPoolId': 'COGNITO_USER_POOL_ID',
-            'UserPoolClientId': 'COGNITO_CLIENT_ID',
-            'HealthCoachAIRuntimeId': 'HEALTH_COACH_AI_RUNTIME_ID',
-            'AccountId': 'AWS_ACCOUNT_ID'
-        }
         
+        # Single pass over the outputs, picking out only the keys we know
         configured_count = 0
-        for cf_key, env_var in config_mapping.items():
-            if cf_key in outputs:
-                os.environ[env_var] = outputs[cf_key]
+        for output in stack.get('Outputs', ()):
+            env_var = _CF_OUTPUT_TO_ENV.get(output['OutputKey'])
+            if env_var is not None:
+                os.environ[env_var] = output['OutputValue']
                 configured_count += 1
         
         if configured_count > 0:
-            print(f"   ✅ Loaded {configured_count} variables from CloudFormation stack: {stack_name}")
+            log(f"   ✅ Loaded {configured_count} variables from CloudFormation stack: {stack_name}")
         else:
-            print(f"   ⚠️  No configuration found in CloudFormation stack: {stack_name}")
+            log(f"   ⚠️  No configuration found in CloudFormation stack: {stack_name}")
             
     except ClientError as e:
         if e.response['Error']['Code'] == 'ValidationError':
-            print(f"   ⚠️  CloudFormation stack '{stack_name}' not found")
+            log(f"   ⚠️  CloudFormation stack '{stack_name}' not found")
         else:
-            print(f"   ⚠️  CloudFormation error: {e.response['Error']['Code']}")
+            log(f"   ⚠️  CloudFormation error: {e.response['Error']['Code']}")
 
 
-def _load_aws_account_id(region: str):
+def _load_aws_account_id(session, log=print):
     """Load AWS Account ID from STS"""
     if os.getenv("AWS_ACCOUNT_ID"):
         return
         
     try:
-        sts_client = boto3.client('sts', region_name=region)
+        sts_client = _create_client(session, 'sts')
         identity = sts_client.get_caller_identity()
         account_id = identity['Account']
-        os.environ["AWS_ACCOUNT_ID"] = account_id
-        print(f"   ✅ AWS Account ID: {account_id}")
+        os.environ.setdefault("AWS_ACCOUNT_ID", account_id)
+        log(f"   ✅ AWS Account ID: {account_id}")
     except Exception as e:
-        print(f"   ⚠️  Could not get AWS Account ID: {e}")
+        log(f"   ⚠️  Could not get AWS Account ID: {e}")
 
 
-def _load_healthcoach_runtime_id(region: str):
+def _load_healthcoach_runtime_id(session, log=print):
     """Load HealthCoachAI Runtime ID from AgentCore"""
     if os.getenv("HEALTH_COACH_AI_RUNTIME_ID"):
         return
-        
+    
+    from botocore.exceptions import ClientError
+    
     try:
         # Try AgentCore API first
-        agentcore_client = boto3.client('bedrock-agentcore-control', region_name=region)
-        response = agentcore_client.list_agent_runtimes()
-        runtimes = response.get('agentRuntimes', [])
+        agentcore_client = _create_client(session, 'bedrock-agentcore-control')
+        paginator = agentcore_client.get_paginator('list_agent_runtimes')
+        
+        def find_runtime_id():
+            # Walk every page, stopping (and fetching no more pages) on first match
+            for page in paginator.paginate(PaginationConfig={'PageSize': 50}):
+                for runtime in page.get('agentRuntimes', []):
+                    name = runtime.get('agentRuntimeName', '').casefold()
+                    if any(needle in name for needle in _RUNTIME_NEEDLES):
+                        return runtime.get('agentRuntimeId', '')
+            return None
         
-        for runtime in runtimes:
-            runtime_name = runtime.get('agentRuntimeName', '')
-            runtime_id = runtime.get('agentRuntimeId', '')
-            if 'healthmate_coach_ai' in runtime_name.lower():
-                os.environ["HEALTH_COACH_AI_RUNTIME_ID"] = runtime_id
-                print(f"   ✅ HealthCoachAI Runtime ID: {runtime_id}")
-                return
+        runtime_id = find_runtime_id()
+        if runtime_id:
+            os.environ.setdefault("HEALTH_COACH_AI_RUNTIME_ID", runtime_id)
+            log(f"   ✅ HealthCoachAI Runtime ID: {runtime_id}")
+            return
         
-        print("   ⚠️  HealthCoachAI runtime not found in AgentCore")
+        log("   ⚠️  HealthCoachAI runtime not found in AgentCore")
         
     except ClientError as e:
-        print(f"   ⚠️  AgentCore API error: {e.response['Error']['Code']}")
+        log(f"   ⚠️  AgentCore API error: {e.response['Error']['Code']}")
         
-        # Fallback to CLI if API fails
-        _try_agentcore_cli()
+        # Fallback to CLI if API fails. This lookup runs alongside the
+        # CloudFormation one, so skip the CLI (up to 10s) when the stack
+        # outputs have already provided the runtime ID in the meantime.
+        if os.getenv("HEALTH_COACH_AI_RUNTIME_ID"):
+            return
+        _try_agentcore_cli(log)
     except Exception as e:
-        print(f"   ⚠️  Could not get HealthCoachAI Runtime ID: {e}")
+        log(f"   ⚠️  Could not get HealthCoachAI Runtime ID: {e}")
 
 
-def _try_agentcore_cli():
+def _try_agentcore_cli(log=print):
     """Fallback to AgentCore CLI"""
     try:
         import subprocess
-        import json
+        try:
+            import orjson as json_parser
+        except ImportError:
+            json_parser = json
         
         result = subprocess.run(
             ['agentcore', 'list', '--format', 'json'],
             capture_output=True,
-            text=True,
             timeout=10
         )
         
         if result.returncode == 0:
-            runtimes = json.loads(result.stdout)
+            runtimes = json_parser.loads(result.stdout)
             for runtime in runtimes:
-                if 'health_coach_ai' in runtime.get('name', '').lower():
-                    runtime_id = runtime.get('name')
-                    os.environ["HEALTH_COACH_AI_RUNTIME_ID"] = runtime_id
-                    print(f"   ✅ HealthCoachAI Runtime ID (CLI): {runtime_id}")
+                runtime_id = runtime.get('name', '')
+                name = runtime_id.casefold()
+                if any(needle in name for needle in _CLI_RUNTIME_NEEDLES):
+                    os.environ.setdefault("HEALTH_COACH_AI_RUNTIME_ID", runtime_id)
+                    log(f"   ✅ HealthCoachAI Runtime ID (CLI): {runtime_id}")
                     return
         
-        print("   ⚠️  AgentCore CLI: No HealthCoachAI runtime found")
+        log("   ⚠️  AgentCore CLI: No HealthCoachAI runtime found")
         
     except FileNotFoundError:
-        print("   ⚠️  AgentCore CLI not installed")
+        log("   ⚠️  AgentCore CLI not installed")
     except Exception as e:
-        print(f"   ⚠️  AgentCore CLI error: {e}")
+        log(f"   ⚠️  AgentCore CLI error: {e}")
+
+
+# KEY=value assignments, optionally prefixed with "export"; comment lines never match
+_ENV_LINE_RE = re.compile(r'^[ \t]*(?:export[ \t]+)?([A-Za-z_]\w*)[ \t]*=[ \t]*(.*?)[ \t]*\r?$', re.MULTILINE)
+
+
+def load_env_file(env_file: str):
+    """Set the .env file's variables that are not already in the environment"""
+    with open(env_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    for key, value in _ENV_LINE_RE.findall(text):
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+            value = value[1:-1]
+        os.environ.setdefault(key, value)
 
 
 def check_env_file():
@@ -154,28 +343,40 @@ def check_env_file():
     if os.path.exists(env_file):
         print("📄 Loading .env file...")
         try:
-            with open(env_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        # Only set if not already in environment
-                        if key not in os.environ:
-                            os.environ[key] = value
+            load_env_file(env_file)
             print("   ✅ .env file loaded")
         except Exception as e:
             print(f"   ⚠️  Error loading .env file: {e}")
     print()
 
 
+def _precompile_app():
+    """Byte-compile the app package so reloads import from up-to-date .pyc files"""
+    app_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app')
+    compileall.compile_dir(app_dir, quiet=1)
+
+
+def _select_server_backends():
+    """Pick the C-accelerated event loop and HTTP parser when installed"""
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
+
 def main():
     """Start the development server"""
     print("🚀 Starting HealthmateUI Development Server")
     print("=" * 50)
     
+    if "--refresh-config" in sys.argv[1:]:
+        os.environ["HEALTHMATE_REFRESH_CONFIG"] = "1"
+    if "--offline" in sys.argv[1:]:
+        os.environ["HEALTHMATE_SKIP_AWS_BOOTSTRAP"] = "1"
+    
     # Load configuration
     check_env_file()
     load_aws_config()
+    _precompile_app()
     
     # Import and validate configuration
     from app.utils.config import get_config
@@ -188,7 +389,10 @@ def main():
         print(f"Environment: {config.__class__.__name__}")
         print(f"Debug Mode: {config.DEBUG}")
         print(f"AWS Region: {config.AWS_REGION}")
+        loop, http = _select_server_backends()
+        
         print(f"Server: http://localhost:8000")
+        print(f"Server Backends: loop={loop}, http={http}")
         print("Press Ctrl+C to stop the server")
         print("-" * 50)
         
@@ -197,9 +401,17 @@ def main():
             host="0.0.0.0",
             port=8000,
             reload=True,
-            reload_dirs=["app", "templates", "static"],
+            # Only Python changes need a restart: Jinja2 re-reads templates
+            # and static files are served from disk on every request
+            reload_dirs=["app"],
+            reload_includes=["*.py"],
+            reload_excludes=["*.pyc", "__pycache__/*"],
+            # Debounce editors that write a file in several quick steps
+            reload_delay=0.25,
             log_level="debug" if config.DEBUG else "info",
-            access_log=True
+            access_log=True,
+            loop=loop,
+            http=http
         )
         
     except ValueError as e:
@@ -0,0 +1,17 @@
+"""
+Shared setup for the standalone test scripts in this directory
+"""
+import asyncio
+import importlib.util
+import os
+
+
+def prepare_script_run():
+    """Prepare the process before a test script starts its event loop"""
+    # Tests are I/O bound, so use uvloop when installed
+    if importlib.util.find_spec("uvloop"):
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
+    # app.main mounts static/ and templates/ relative to the working directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
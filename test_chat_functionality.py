@@ -4,82 +4,102 @@ Chat functionality test
 Simple test to verify the chat functionality works correctly
 """
 import sys
-import os
 
-# Add the app directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+import pytest
 
 from app.models.chat import ChatMessage, MessageRole, SendMessageRequest
 from app.services.chat_service import ChatService
 
 
-def test_chat_functionality():
-    """Test chat functionality"""
-    print("🧪 Testing Chat Functionality")
-    print("=" * 50)
-    
-    # Test message validation
-    try:
-        request = SendMessageRequest(
-            message="Hello, this is a test message",
-            timezone="Asia/Tokyo",
-            language="ja"
-        )
-        print(f"✅ Message validation: {request.message}")
-    except Exception as e:
-        print(f"❌ Message validation failed: {e}")
-        return
-    
-    # Test chat service
-    try:
-        chat_service = ChatService()
-        
-        # Create a test user session
-        user_id = "test-user-123"
-        session = chat_service.create_session(user_id)
-        print(f"✅ Session created: {session.session_id}")
-        
-        # Add a user message
-        user_message = chat_service.add_message(
-            user_id=user_id,
-            content="Hello, HealthCoach!",
-            role=MessageRole.USER,
-            session_id=session.session_id
-        )
-        print(f"✅ User message added: {user_message.id}")
-        
-        # Add an AI response
-        ai_message = chat_service.add_message(
-            user_id=user_id,
-            content="Hello! How can I help you with your health today?",
-            role=MessageRole.ASSISTANT,
-            session_id=session.session_id
-        )
-        print(f"✅ AI message added: {ai_message.id}")
-        
-        # Get chat history
-        history = chat_service.get_chat_history(user_id, session.session_id)
-        print(f"✅ Chat history retrieved: {len(history)} messages")
-        
-        # Test message count
-        count = chat_service.get_message_count(user_id, session.session_id)
-        print(f"✅ Message count: {count}")
-        
-    except Exception as e:
-        print(f"❌ Chat service test failed: {e}")
-        return
+TEST_USER_ID = "test-user-123"
+
+# (role, content) pairs added to the shared session, in order
+MESSAGE_CASES = [
+    (MessageRole.USER, "Hello, HealthCoach!"),
+    (MessageRole.ASSISTANT, "Hello! How can I help you with your health today?"),
+]
+
+
+@pytest.fixture(scope="module")
+def chat_service():
+    """One ChatService per module; its in-memory stores are shared by the tests"""
+    return ChatService()
+
+
+@pytest.fixture(scope="module")
+def chat_session(chat_service):
+    """Test user session shared by the tests in this module"""
+    return chat_service.get_or_create_session(TEST_USER_ID)
+
+
+@pytest.fixture(scope="module")
+def seeded_session(chat_service):
+    """Separate session holding every MESSAGE_CASES message, in order"""
+    session = chat_service.get_or_create_session("seeded-" + TEST_USER_ID)
+    for role, content in MESSAGE_CASES:
+        chat_service.add_message(session.user_id, content, role, session_id=session.session_id)
+    return session
+
+
+def test_message_validation():
+    """Test message validation"""
+    request = SendMessageRequest(
+        message="Hello, this is a test message",
+        timezone="Asia/Tokyo",
+        language="ja"
+    )
+    assert request.message == "Hello, this is a test message"
+
+
+def test_session_created(chat_session):
+    """Test session creation"""
+    assert chat_session.session_id
+    assert chat_session.user_id == TEST_USER_ID
+
+
+@pytest.mark.parametrize("role,content", MESSAGE_CASES)
+def test_add_message(chat_service, chat_session, role, content):
+    """Test adding user and AI messages"""
+    message = chat_service.add_message(
+        user_id=TEST_USER_ID,
+        content=content,
+        role=role,
+        session_id=chat_session.session_id
+    )
+    assert isinstance(message, ChatMessage)
+    assert message.id
+    assert message.role == role
+    assert message.content == content
+
+
+def test_chat_history(chat_service, seeded_session):
+    """Test chat history retrieval"""
+    history = chat_service.get_chat_history(seeded_session.user_id, seeded_session.session_id)
+    assert [message.content for message in history] == [content for _, content in MESSAGE_CASES]
+
+
+def test_message_count(chat_service, seeded_session):
+    """Test message count"""
+    assert chat_service.get_message_count(seeded_session.user_id, seeded_session.session_id) == len(MESSAGE_CASES)
+    assert chat_service.get_message_count(seeded_session.user_id) == len(MESSAGE_CASES)
+
+
+def test_message_count_after_session_recreated():
+    """Test the user total drops messages of a re-created session"""
+    service = ChatService()
+    session = service.get_or_create_session(TEST_USER_ID)
+    for role, content in MESSAGE_CASES:
+        service.add_message(TEST_USER_ID, content, role, session_id=session.session_id)
+    service.add_message(TEST_USER_ID, "Another session", MessageRole.USER)
     
-    print("\n📋 Chat Functionality Summary:")
-    print("- Message validation: ✅ Working")
-    print("- Chat service: ✅ Working")
-    print("- Session management: ✅ Working")
-    print("- Message storage: ✅ Working")
-    print("- History retrieval: ✅ Working")
-    print("- API endpoints: ✅ Created")
-    print("- Input sanitization: ✅ Implemented")
+    # Another user claiming the session ID makes the next lookup re-create it
+    service.get_or_create_session("other-user", session.session_id)
+    recreated = service.get_or_create_session(TEST_USER_ID, session.session_id)
     
-    print("\n🚀 Ready for next task: Streaming functionality implementation")
+    assert recreated.session_id == session.session_id
+    assert service.get_message_count(TEST_USER_ID, session.session_id) == 0
+    assert service.get_message_count(TEST_USER_ID) == len(service.get_chat_history(TEST_USER_ID)) == 1
 
 
 if __name__ == "__main__":
-    test_chat_functionality()
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -7,331 +7,470 @@ This test starts a FastAPI server, creates a demo user session,
 and tests the full integration through FastAPI endpoints.
 """
 import asyncio
-import uuid
-import boto3
-import hashlib
-import hmac
-import base64
+import functools
+import importlib.util
 import json
+import logging
 import sys
 import os
-import httpx
-import threading
+import random
 import time
-import uvicorn
-import requests
-from datetime import datetime
-from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 
-# Add the app directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+from app.utils.env import env_flag
+from run_dev import load_cached_config, load_env_file, save_cached_config
+
+try:
+    # orjson parses bytes directly; its JSONDecodeError subclasses json's
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Test progress goes through a logger so HEALTHMATE_E2E_QUIET=1 can silence
+# everything but warnings and failures (e.g. in CI)
+log = logging.getLogger("e2e")
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+log.addHandler(_log_handler)
+log.propagate = False
+log.setLevel(logging.WARNING if env_flag("HEALTHMATE_E2E_QUIET") else logging.INFO)
+
+
+@functools.lru_cache(maxsize=None)
+def _session():
+    """boto3 Session shared by every AWS client in this module"""
+    # Imported here: boto3 is slow to import and unused on a cache hit
+    import boto3
+    
+    return boto3.Session()
+
+
+@functools.lru_cache(maxsize=None)
+def _client(service: str, region: str):
+    """Create (once) a client for the service from the shared session"""
+    from botocore.config import Config
+    
+    # Parallel CI jobs hit the same (throttle-prone) control-plane APIs;
+    # adaptive mode backs off client-side when throttled
+    return _session().client(
+        service,
+        region_name=region,
+        config=Config(retries={'max_attempts': 10, 'mode': 'adaptive'})
+    )
+
+
+# Resolved AWS values are cached between runs, in a file of their own
+# because the Cognito client secret is cached too
+E2E_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "healthmate", "e2e_config.json")
+_E2E_REQUIRED_ENV_VARS = ("COGNITO_USER_POOL_ID", "COGNITO_CLIENT_ID", "HEALTH_COACH_AI_RUNTIME_ID", "AWS_ACCOUNT_ID")
 
 
 def load_configuration():
     """Load configuration using the same logic as run_dev.py"""
-    print("🔧 Loading configuration...")
+    log.info("🔧 Loading configuration...")
     
     # Load .env file if exists
     env_file = os.path.join(os.path.dirname(__file__), '.env')
     if os.path.exists(env_file):
-        print("   📄 Loading .env file...")
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    if key not in os.environ:
-                        os.environ[key] = value
+        log.info("   📄 Loading .env file...")
+        load_env_file(env_file)
+    
+    region = os.getenv("AWS_REGION", "us-west-2")
+    stack_name = os.getenv("HEALTH_STACK_NAME", "Healthmate-HealthManagerStack")
+    
+    cached = load_cached_config(stack_name, region, E2E_CACHE_FILE, refresh_env="HEALTHMATE_E2E_CACHE_BUST")
+    if cached:
+        for env_var, value in cached.items():
+            os.environ.setdefault(env_var, value)
+        log.info("   ✅ Loaded %s variables from cache: %s", len(cached), E2E_CACHE_FILE)
+        return
     
     # Load AWS configuration (same as run_dev.py)
     try:
-        region = os.getenv("AWS_REGION", "us-west-2")
-        cf_client = boto3.client('cloudformation', region_name=region)
-        stack_name = os.getenv("HEALTH_STACK_NAME", "Healthmate-HealthManagerStack")
-        
-        print(f"   📋 Checking CloudFormation stack: {stack_name}")
+        # Clients share one session so credentials are resolved once
+        cf_client = _client('cloudformation', region)
         
-        # Get stack outputs
-        response = cf_client.describe_stacks(StackName=stack_name)
-        stack = response['Stacks'][0]
-        outputs = {output['OutputKey']: output['OutputValue'] for output in stack.get('Outputs', [])}
+        log.info("   📋 Checking CloudFormation stack: %s", stack_name)
         
-        # Set environment variables from CloudFormation outputs
-        config_mapping = {
-            'UserPoolId': 'COGNITO_USER_POOL_ID',
-            'UserPoolClientId': 'COGNITO_CLIENT_ID',
-            'HealthCoachAIRuntimeId': 'HEALTH_COACH_AI_RUNTIME_ID',
-            'AccountId': 'AWS_ACCOUNT_ID'
-        }
+        # Spread out concurrent cache misses from parallel jobs
+        time.sleep(random.uniform(0, 0.2))
         
-        for cf_key, env_var in config_mapping.items():
-            if cf_key in outputs and not os.getenv(env_var):
-                os.environ[env_var] = outputs[cf_key]
-                print(f"   ✅ {env_var}: {outputs[cf_key][:10]}...")
-        
-        # Get AWS Account ID if not set
-        if not os.getenv("AWS_ACCOUNT_ID"):
-            sts_client = boto3.client('sts', region_name=region)
-            identity = sts_client.get_caller_identity()
-            os.environ["AWS_ACCOUNT_ID"] = identity['Account']
-            print(f"   ✅ AWS Account ID: {identity['Account']}")
-        
-        # Get Cognito Client Secret
-        if not os.getenv("COGNITO_CLIENT_SECRET"):
-            user_pool_id = os.getenv("COGNITO_USER_POOL_ID")
-            client_id = os.getenv("COGNITO_CLIENT_ID")
-            
-            if user_pool_id and client_id:
-                cognito_client = boto3.client('cognito-idp', region_name=region)
-                response = cognito_client.describe_user_pool_client(
-                    UserPoolId=user_pool_id,
-                    ClientId=client_id
-                )
+        # describe_stacks, get_caller_identity and list_agent_runtimes are
+        # independent, so overlap them; only describe_user_pool_client needs
+        # the stack outputs. Stack outputs still take precedence: the STS and
+        # AgentCore results only fill values that are unset afterwards.
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            stack_future = executor.submit(cf_client.describe_stacks, StackName=stack_name)
+            
+            identity_future = None
+            if not os.getenv("AWS_ACCOUNT_ID"):
+                identity_future = executor.submit(_client('sts', region).get_caller_identity)
+            
+            runtimes_future = None
+            if not os.getenv("HEALTH_COACH_AI_RUNTIME_ID"):
+                runtimes_future = executor.submit(_client('bedrock-agentcore-control', region).list_agent_runtimes)
+            
+            # Get stack outputs
+            response = stack_future.result()
+            stack = response['Stacks'][0]
+            outputs = {output['OutputKey']: output['OutputValue'] for output in stack.get('Outputs', [])}
+            
+            # Set environment variables from CloudFormation outputs
+            config_mapping = {
+                'UserPoolId': 'COGNITO_USER_POOL_ID',
+                'UserPoolClientId': 'COGNITO_CLIENT_ID',
+                'HealthCoachAIRuntimeId': 'HEALTH_COACH_AI_RUNTIME_ID',
+                'AccountId': 'AWS_ACCOUNT_ID'
+            }
+            
+            for cf_key, env_var in config_mapping.items():
+                if cf_key in outputs and not os.getenv(env_var):
+                    os.environ[env_var] = outputs[cf_key]
+                    log.info("   ✅ %s: %s...", env_var, outputs[cf_key][:10])
+            
+            # Get Cognito Client Secret
+            secret_future = None
+            if not os.getenv("COGNITO_CLIENT_SECRET"):
+                user_pool_id = os.getenv("COGNITO_USER_POOL_ID")
+                client_id = os.getenv("COGNITO_CLIENT_ID")
+                
+                if user_pool_id and client_id:
+                    secret_future = executor.submit(
+                        _client('cognito-idp', region).describe_user_pool_client,
+                        UserPoolId=user_pool_id,
+                        ClientId=client_id
+                    )
+            
+            # Get AWS Account ID if not set
+            if identity_future and not os.getenv("AWS_ACCOUNT_ID"):
+                identity = identity_future.result()
+                os.environ["AWS_ACCOUNT_ID"] = identity['Account']
+                log.info("   ✅ AWS Account ID: %s", identity['Account'])
+            
+            if secret_future:
+                response = secret_future.result()
                 client_secret = response['UserPoolClient'].get('ClientSecret')
                 if client_secret:
                     os.environ["COGNITO_CLIENT_SECRET"] = client_secret
-                    print(f"   ✅ Cognito Client Secret: {client_secret[:10]}...")
-        
-        # Get HealthCoachAI Runtime ID
-        if not os.getenv("HEALTH_COACH_AI_RUNTIME_ID"):
-            agentcore_client = boto3.client('bedrock-agentcore-control', region_name=region)
-            response = agentcore_client.list_agent_runtimes()
-            runtimes = response.get('agentRuntimes', [])
-            
-            for runtime in runtimes:
-                runtime_name = runtime.get('agentRuntimeName', '')
-                runtime_id = runtime.get('agentRuntimeId', '')
-                if 'health_coach_ai' in runtime_name.lower():
-                    os.environ["HEALTH_COACH_AI_RUNTIME_ID"] = runtime_id
-                    print(f"   ✅ HealthCoachAI Runtime ID: {runtime_id}")
-                    break
+                    log.info("   ✅ Cognito Client Secret: %s...", client_secret[:10])
+            
+            # Get HealthCoachAI Runtime ID
+            if runtimes_future and not os.getenv("HEALTH_COACH_AI_RUNTIME_ID"):
+                response = runtimes_future.result()
+                runtimes = response.get('agentRuntimes', [])
+                
+                for runtime in runtimes:
+                    runtime_name = runtime.get('agentRuntimeName', '')
+                    runtime_id = runtime.get('agentRuntimeId', '')
+                    if 'health_coach_ai' in runtime_name.lower():
+                        os.environ["HEALTH_COACH_AI_RUNTIME_ID"] = runtime_id
+                        log.info("   ✅ HealthCoachAI Runtime ID: %s", runtime_id)
+                        break
         
-        print("   ✅ Configuration loaded successfully")
+        log.info("   ✅ Configuration loaded successfully")
+        try:
+            save_cached_config(stack_name, region, E2E_CACHE_FILE, _E2E_REQUIRED_ENV_VARS,
+                               optional_names=("COGNITO_CLIENT_SECRET",))
+        except OSError as e:
+            log.warning("   ⚠️  Could not write config cache: %s", e)
         
     except Exception as e:
-        print(f"   ⚠️  Configuration loading error: {e}")
-        print("   💡 Some tests may fail if required environment variables are not set")
+        log.warning("   ⚠️  Configuration loading error: %s", e)
+        log.info("   💡 Some tests may fail if required environment variables are not set")
 
 
 # Load configuration before importing config
 load_configuration()
 
 from app.utils.config import get_config
+from script_support import prepare_script_run
 
 # Test configuration
 config = get_config()
 
 
+class StreamState:
+    """Progress of one SSE stream, shared by the event handlers"""
+    
+    def __init__(self):
+        self.events_received = 0
+        self.ai_text_chunks = []
+        # Echo AI text in batches rather than flushing every chunk
+        self.pending_text = []
+    
+    def flush_pending_text(self):
+        if self.pending_text:
+            if log.isEnabledFor(logging.INFO):
+                sys.stdout.write(''.join(self.pending_text))
+                sys.stdout.flush()
+            self.pending_text.clear()
+
+
+# Handler outcomes that end the stream loop (None means keep reading);
+# unique sentinels, so the loop can compare them by identity
+STREAM_DONE = object()
+STREAM_FAILED = object()
+
+
+def _on_connected(event_data, state):
+    log.info("   📡 Connected: %s", event_data.get('message'))
+
+
+def _on_user_message(event_data, state):
+    log.info("   👤 User message processed")
+
+
+def _on_ai_thinking(event_data, state):
+    log.info("   🤔 AI thinking...")
+
+
+def _on_ai_chunk(event_data, state):
+    # Text is directly in event_data, not nested in 'data'
+    text = event_data.get('text', '')
+    if text:  # Only append non-empty text
+        state.ai_text_chunks.append(text)
+        state.pending_text.append(text)
+        if len(state.pending_text) >= 64:
+            state.flush_pending_text()
+
+
+def _on_ai_message_complete(event_data, state):
+    state.flush_pending_text()
+    log.info("\n   ✅ AI message complete")
+
+
+def _on_complete(event_data, state):
+    state.flush_pending_text()
+    log.info("   🎉 Streaming complete")
+    return STREAM_DONE
+
+
+def _on_error(event_data, state):
+    state.flush_pending_text()
+    log.error("   ❌ Streaming error: %s", event_data.get('error'))
+    return STREAM_FAILED
+
+
+def _on_unknown_event(event_data, state):
+    # Log unknown event types for debugging
+    state.flush_pending_text()
+    log.info("\n   🔍 Unknown event: %s", event_data.get('type'))
+
+
+# SSE event type -> handler, looked up once per event
+SSE_EVENT_HANDLERS = {
+    'connected': _on_connected,
+    'user_message': _on_user_message,
+    'ai_thinking': _on_ai_thinking,
+    'ai_chunk': _on_ai_chunk,
+    'ai_message_complete': _on_ai_message_complete,
+    'complete': _on_complete,
+    'error': _on_error,
+}
+
+
 class E2EHealthCoachTest:
     """End-to-End HealthCoachAI integration test"""
     
+    # Endpoints, relative to the shared client's base_url
+    DEMO_LOGIN_URL = "/auth/demo"
+    HEALTH_URL = "/health"
+    CHAT_URL = "/api/chat/send"
+    STREAM_URL = "/api/streaming/chat"
+    HISTORY_URL = "/api/chat/history"
+    
+    # Markers matched in responses
+    CHAT_MESSAGE_MARKER = 'flex items-start space-x-3'
+    _DATA_PREFIX = b"data: "
+    _FRAME_END = b"\n\n"
+    
     def __init__(self):
         self.config = config
-        # Use default AWS session which should have credentials
-        session = boto3.Session()
-        self.cognito_client = session.client('cognito-idp', region_name=self.config.AWS_REGION)
-        self.cfn_client = session.client('cloudformation', region_name=self.config.AWS_REGION)
         self.test_username = None
         self.jwt_token = None
         self.session_cookie = None
         self.fastapi_base_url = "http://localhost:8001"  # Use different port for testing
-        self.server_thread = None
+        self.server_task = None
         self.server = None
+        self.http = None
+        
+    async def open_http_client(self):
+        """Create the HTTP client shared by every test request"""
+        import httpx
         
-    def _get_client_secret(self) -> str:
-        """Get Cognito Client Secret from configuration"""
-        print("🔑 Using configured Cognito Client Secret...")
-        client_secret = self.config.COGNITO_CLIENT_SECRET
-        if not client_secret:
-            raise ValueError("COGNITO_CLIENT_SECRET not configured")
-        print(f"   ✅ Client Secret: {client_secret[:10]}...")
-        return client_secret
+        transport = httpx.AsyncHTTPTransport(
+            # Retry failed connection attempts (e.g. right after server startup)
+            retries=2,
+            # Streaming responses hold a connection for their whole lifetime;
+            # keep the pool wide enough that other requests never queue behind it
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=30.0)
+        )
+        self.http = httpx.AsyncClient(
+            base_url=self.fastapi_base_url,
+            timeout=60.0,
+            transport=transport
+        )
     
-    def _calculate_secret_hash(self, username: str) -> str:
-        """Calculate Cognito Client Secret Hash"""
-        client_secret = self.config.COGNITO_CLIENT_SECRET
-        message = username + self.config.COGNITO_CLIENT_ID
-        dig = hmac.new(
-            client_secret.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).digest()
-        return base64.b64encode(dig).decode()
+    async def close_http_client(self):
+        """Close the shared HTTP client"""
+        if self.http:
+            await self.http.aclose()
+            self.http = None
     
     async def setup_test_user(self):
         """Setup test user using demo login (simplified for testing)"""
         try:
-            print("🔐 Setting up test user using demo login...")
+            log.info("🔐 Setting up test user using demo login...")
             
             # Use demo login to get session
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.fastapi_base_url}/auth/demo",
-                    headers={"Content-Type": "application/json"}
-                )
-                
-                if response.status_code != 200:
-                    raise Exception(f"Demo login failed: {response.status_code} - {response.text}")
-                
-                result = response.json()
-                if not result.get("success"):
-                    raise Exception(f"Demo login failed: {result.get('error', 'Unknown error')}")
-                
-                # Extract session cookie
-                session_cookie = None
-                if hasattr(response, 'cookies'):
-                    # httpx response cookies
-                    for cookie_name, cookie_value in response.cookies.items():
-                        if cookie_name == "healthmate_session":
-                            session_cookie = cookie_value
-                            break
-                
-                if not session_cookie:
-                    raise Exception("No session cookie received from demo login")
-                
-                self.session_cookie = session_cookie
-                print(f"   ✅ Demo login successful, session: {session_cookie[:20]}...")
-                
-                # Create a mock JWT token for HealthCoachAI (demo mode)
-                self.jwt_token = "demo-jwt-token-for-testing"
-                self.test_username = "demo_user"
-                
-                return True
-            
-            self.jwt_token = auth_response['AuthenticationResult']['AccessToken']
+            response = await self.http.post(
+                self.DEMO_LOGIN_URL,
+                headers={"Content-Type": "application/json"}
+            )
             
-            print(f"   ✅ User created and authenticated")
-            print(f"   JWT Token: {self.jwt_token[:50]}...")
+            if response.status_code != 200:
+                raise Exception(f"Demo login failed: {response.status_code} - {response.text}")
             
-            # Decode JWT to show user info
-            payload = self._decode_jwt_payload(self.jwt_token)
-            user_id = payload.get('sub')
-            print(f"   User ID (sub): {user_id}")
+            result = response.json()
+            if not result.get("success"):
+                raise Exception(f"Demo login failed: {result.get('error', 'Unknown error')}")
             
-            return True
+            # Extract session cookie
+            session_cookie = None
+            if hasattr(response, 'cookies'):
+                # httpx response cookies
+                for cookie_name, cookie_value in response.cookies.items():
+                    if cookie_name == "healthmate_session":
+                        session_cookie = cookie_value
+                        break
             
-        except Exception as e:
-            print(f"   ❌ Test user setup failed: {e}")
-            return False
-    
-    def _decode_jwt_payload(self, jwt_token: str) -> dict:
-        """Decode JWT token payload (without signature verification)"""
-        try:
-            parts = jwt_token.split('.')
-            if len(parts) != 3:
-                raise ValueError("Invalid JWT format")
+            if not session_cookie:
+                raise Exception("No session cookie received from demo login")
             
-            payload = parts[1]
-            padding = 4 - (len(payload) % 4)
-            if padding != 4:
-                payload += '=' * padding
+            self.session_cookie = session_cookie
+            # The shared client's cookie jar already holds this cookie from the
+            # login response, so every later request sends it automatically
+            log.info("   ✅ Demo login successful, session: %s...", session_cookie[:20])
             
-            decoded_bytes = base64.urlsafe_b64decode(payload)
-            payload_data = json.loads(decoded_bytes.decode('utf-8'))
+            # Create a mock JWT token for HealthCoachAI (demo mode)
+            self.jwt_token = "demo-jwt-token-for-testing"
+            self.test_username = "demo_user"
             
-            return payload_data
+            return True
             
         except Exception as e:
-            print(f"JWT decode error: {e}")
-            return {}
+            log.error("   ❌ Test user setup failed: %s", e)
+            return False
     
-    def start_test_server(self):
-        """Start FastAPI server in a separate thread for testing"""
+    async def start_test_server(self):
+        """Start FastAPI server on the current event loop for testing"""
         try:
-            print("🚀 Starting test FastAPI server...")
+            log.info("🚀 Starting test FastAPI server...")
             
-            # Import the FastAPI app
+            # Import the FastAPI app and server only when they are needed
+            import uvicorn
             from app.main import app
             
-            # Configure uvicorn server
+            # Configure uvicorn server: C-accelerated HTTP parser when
+            # installed, and no lifespan (the app's hooks only log). The
+            # event loop is the test's own (uvloop when installed, see main)
             config = uvicorn.Config(
                 app,
                 host="127.0.0.1",
                 port=8001,
                 log_level="warning",  # Reduce log noise during testing
-                access_log=False
+                access_log=False,
+                http="httptools" if importlib.util.find_spec("httptools") else "h11",
+                lifespan="off",
+                server_header=False,
+                date_header=False
             )
             
             self.server = uvicorn.Server(config)
+            # Leave Ctrl+C to the test runner instead of stopping only the server
+            self.server.install_signal_handlers = lambda: None
             
-            # Start server in a separate thread
-            def run_server():
-                asyncio.run(self.server.serve())
+            # Signal readiness from uvicorn's own startup instead of polling
+            ready = asyncio.Event()
+            serve_startup = self.server.startup
             
-            self.server_thread = threading.Thread(target=run_server, daemon=True)
-            self.server_thread.start()
+            async def startup(sockets=None):
+                try:
+                    await serve_startup(sockets=sockets)
+                except SystemExit:
+                    # uvicorn exits the process when it cannot bind; just stop serving
+                    self.server.should_exit = True
+                if not self.server.should_exit:
+                    ready.set()
+            
+            self.server.startup = startup
+            
+            # Serve alongside the tests on the same event loop
+            self.server_task = asyncio.create_task(self.server.serve())
             
-            # Wait for server to start
+            # Wait for server to start (or to stop early)
             max_wait = 10  # seconds
-            wait_time = 0
-            while wait_time < max_wait:
-                try:
-                    # Test if server is responding
-                    import requests
-                    response = requests.get(f"{self.fastapi_base_url}/health", timeout=1)
-                    if response.status_code == 200:
-                        print(f"   ✅ Test server started on {self.fastapi_base_url}")
-                        return True
-                except:
-                    pass
-                
-                time.sleep(0.5)
-                wait_time += 0.5
+            ready_task = asyncio.create_task(ready.wait())
+            await asyncio.wait({ready_task, self.server_task}, timeout=max_wait, return_when=asyncio.FIRST_COMPLETED)
+            ready_task.cancel()
+            
+            if ready.is_set():
+                log.info("   ✅ Test server started on %s", self.fastapi_base_url)
+                return True
             
-            print(f"   ❌ Test server failed to start within {max_wait} seconds")
+            log.error("   ❌ Test server failed to start within %s seconds", max_wait)
             return False
             
         except Exception as e:
-            print(f"   ❌ Error starting test server: {e}")
+            log.error("   ❌ Error starting test server: %s", e)
             return False
     
-    def stop_test_server(self):
+    async def stop_test_server(self):
         """Stop the test FastAPI server"""
         try:
             if self.server:
-                print("🛑 Stopping test server...")
+                log.info("🛑 Stopping test server...")
                 self.server.should_exit = True
                 
-                # Wait for server thread to finish
-                if self.server_thread and self.server_thread.is_alive():
-                    self.server_thread.join(timeout=5)
+                # Wait for the server task to finish
+                if self.server_task:
+                    await asyncio.wait_for(self.server_task, timeout=5)
                 
-                print("   ✅ Test server stopped")
+                log.info("   ✅ Test server stopped")
             
         except Exception as e:
-            print(f"   ⚠️  Error stopping test server: {e}")
+            log.warning("   ⚠️  Error stopping test server: %s", e)
     
     async def cleanup_test_user(self):
         """Clean up test user (demo mode - no cleanup needed)"""
         if self.test_username:
-            print(f"   ✅ Demo user session ended: {self.test_username}")
+            log.info("   ✅ Demo user session ended: %s", self.test_username)
         else:
-            print("   ℹ️  No cleanup needed for demo mode")
+            log.info("   ℹ️  No cleanup needed for demo mode")
     
     async def test_fastapi_health(self):
         """Test FastAPI health endpoint"""
         try:
-            print("\n🏥 Testing FastAPI health endpoint...")
+            log.info("\n🏥 Testing FastAPI health endpoint...")
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.fastapi_base_url}/health")
+            response = await self.http.get(self.HEALTH_URL)
+            
+            if response.status_code == 200:
+                data = response.json()
+                log.info("   ✅ Health check passed: %s", data['status'])
+                return True
+            else:
+                log.error("   ❌ Health check failed: %s", response.status_code)
+                return False
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"   ✅ Health check passed: {data['status']}")
-                    return True
-                else:
-                    print(f"   ❌ Health check failed: {response.status_code}")
-                    return False
-                    
         except Exception as e:
-            print(f"   ❌ Health check error: {e}")
+            log.error("   ❌ Health check error: %s", e)
             return False
     
     async def test_fastapi_chat_endpoint(self):
         """Test FastAPI chat endpoint with session cookie"""
         try:
-            print("\n💬 Testing FastAPI chat endpoint...")
+            log.info("\n💬 Testing FastAPI chat endpoint...")
             
             # Prepare form data
             form_data = {
@@ -340,68 +479,63 @@ class E2EHealthCoachTest:
                 "language": "ja"
             }
             
-            print(f"   Sending message: {form_data['message']}")
+            log.info("   Sending message: %s", form_data['message'])
             
-            # Use session cookie for authentication
-            cookies = {"healthmate_session": self.session_cookie}
+            response = await self.http.post(
+                self.CHAT_URL,
+                data=form_data
+            )
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.fastapi_base_url}/api/chat/send",
-                    data=form_data,
-                    cookies=cookies
-                )
-                
-                print(f"   Response status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    # Check if response is HTML (htmx) or JSON
-                    content_type = response.headers.get('content-type', '')
-                    if 'text/html' in content_type:
-                        # HTML response from htmx
-                        html_content = response.text
-                        print(f"   ✅ Chat HTML response received")
-                        print(f"   HTML length: {len(html_content)} characters")
-                        # Check if HTML contains expected message structure
-                        if 'flex items-start space-x-3' in html_content:
-                            print(f"   ✅ HTML contains chat messages")
-                            return True
-                        else:
-                            print(f"   ❌ HTML does not contain expected chat structure")
-                            return False
+            log.info("   Response status: %s", response.status_code)
+            
+            if response.status_code == 200:
+                # Check if response is HTML (htmx) or JSON
+                content_type = response.headers.get('content-type', '')
+                if 'text/html' in content_type:
+                    # HTML response from htmx
+                    html_content = response.text
+                    log.info("   ✅ Chat HTML response received")
+                    log.info("   HTML length: %s characters", len(html_content))
+                    # Check if HTML contains expected message structure
+                    if self.CHAT_MESSAGE_MARKER in html_content:
+                        log.info("   ✅ HTML contains chat messages")
+                        return True
                     else:
-                        # JSON response
-                        data = response.json()
-                        if data.get('success'):
-                            print(f"   ✅ Chat response received")
-                            print(f"   User message ID: {data.get('message_id')}")
-                            if data.get('ai_response'):
-                                ai_content = data['ai_response'].get('content', '')
-                                print(f"   AI response: {ai_content[:100]}...")
-                            return True
-                        else:
-                            print(f"   ❌ Chat failed: {data.get('error')}")
-                            return False
-                elif response.status_code == 401:
-                    print(f"   ❌ Authentication failed - JWT token may be invalid")
-                    return False
+                        log.error("   ❌ HTML does not contain expected chat structure")
+                        return False
                 else:
-                    print(f"   ❌ Chat request failed: {response.status_code}")
-                    try:
-                        error_data = response.json()
-                        print(f"   Error details: {error_data}")
-                    except:
-                        print(f"   Error text: {response.text}")
-                    return False
-                    
+                    # JSON response
+                    data = response.json()
+                    if data.get('success'):
+                        log.info("   ✅ Chat response received")
+                        log.info("   User message ID: %s", data.get('message_id'))
+                        if data.get('ai_response'):
+                            ai_content = data['ai_response'].get('content', '')
+                            log.info("   AI response: %s...", ai_content[:100])
+                        return True
+                    else:
+                        log.error("   ❌ Chat failed: %s", data.get('error'))
+                        return False
+            elif response.status_code == 401:
+                log.error("   ❌ Authentication failed - JWT token may be invalid")
+                return False
+            else:
+                log.error("   ❌ Chat request failed: %s", response.status_code)
+                try:
+                    error_data = response.json()
+                    log.info("   Error details: %s", error_data)
+                except:
+                    log.info("   Error text: %s", response.text)
+                return False
+                
         except Exception as e:
-            print(f"   ❌ Chat endpoint test error: {e}")
+            log.error("   ❌ Chat endpoint test error: %s", e)
             return False
     
     async def test_fastapi_streaming_endpoint(self):
         """Test FastAPI streaming endpoint"""
         try:
-            print("\n📡 Testing FastAPI streaming endpoint...")
+            log.info("\n📡 Testing FastAPI streaming endpoint...")
             
             # Prepare request
             streaming_request = {
@@ -415,204 +549,211 @@ class E2EHealthCoachTest:
                 "Accept": "text/event-stream"
             }
             
-            # Use session cookie for authentication
-            cookies = {"healthmate_session": self.session_cookie}
+            log.info("   Sending streaming message: %s", streaming_request['message'])
             
-            print(f"   Sending streaming message: {streaming_request['message']}")
-            
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.fastapi_base_url}/api/streaming/chat",
-                    json=streaming_request,
-                    headers=headers,
-                    cookies=cookies
-                ) as response:
+            async with self.http.stream(
+                "POST",
+                self.STREAM_URL,
+                json=streaming_request,
+                headers=headers
+            ) as response:
+                
+                log.info("   Streaming response status: %s", response.status_code)
+                
+                if response.status_code == 200:
+                    state = StreamState()
                     
-                    print(f"   Streaming response status: {response.status_code}")
+                    async for payload in self._iter_sse_data(response):
+                        if payload:
+                            try:
+                                event_data = json_loads(payload)
+                            except json.JSONDecodeError:
+                                continue
+                            
+                            state.events_received += 1
+                            handler = SSE_EVENT_HANDLERS.get(event_data.get('type'), _on_unknown_event)
+                            outcome = handler(event_data, state)
+                            if outcome is STREAM_DONE:
+                                break
+                            if outcome is STREAM_FAILED:
+                                return False
                     
-                    if response.status_code == 200:
-                        events_received = 0
-                        ai_text_chunks = []
-                        
-                        async for line in response.aiter_lines():
-                            if line.startswith("data: "):
-                                try:
-                                    event_data = json.loads(line[6:])  # Remove "data: " prefix
-                                    event_type = event_data.get('type')
-                                    
-                                    events_received += 1
-                                    
-                                    if event_type == 'connected':
-                                        print(f"   📡 Connected: {event_data.get('message')}")
-                                    elif event_type == 'user_message':
-                                        print(f"   👤 User message processed")
-                                    elif event_type == 'ai_thinking':
-                                        print(f"   🤔 AI thinking...")
-                                    elif event_type == 'ai_chunk':
-                                        # Text is directly in event_data, not nested in 'data'
-                                        text = event_data.get('text', '')
-                                        if text:  # Only append non-empty text
-                                            ai_text_chunks.append(text)
-                                            print(f"{text}", end='', flush=True)
-                                    elif event_type == 'ai_message_complete':
-                                        print(f"\n   ✅ AI message complete")
-                                    elif event_type == 'complete':
-                                        print(f"   🎉 Streaming complete")
-                                        break
-                                    elif event_type == 'error':
-                                        print(f"   ❌ Streaming error: {event_data.get('error')}")
-                                        return False
-                                    else:
-                                        # Log unknown event types for debugging
-                                        print(f"\n   🔍 Unknown event: {event_type}")
-                                        
-                                except json.JSONDecodeError:
-                                    continue
-                        
-                        complete_ai_response = ''.join(ai_text_chunks)
-                        print(f"\n   Events received: {events_received}")
-                        print(f"   AI text chunks: {len(ai_text_chunks)}")
-                        print(f"   Complete AI response: {complete_ai_response[:100]}...")
-                        
-                        # Success if we received events and have AI response text
-                        success = events_received > 0 and len(complete_ai_response) > 0
-                        if success:
-                            print(f"   ✅ Streaming test successful!")
-                        else:
-                            print(f"   ❌ Streaming test failed - no AI response text")
-                        
-                        return success
+                    state.flush_pending_text()
+                    events_received = state.events_received
+                    ai_text_chunks = state.ai_text_chunks
+                    complete_ai_response = ''.join(ai_text_chunks)
+                    log.info("\n   Events received: %s", events_received)
+                    log.info("   AI text chunks: %s", len(ai_text_chunks))
+                    log.info("   Complete AI response: %s...", complete_ai_response[:100])
+                    
+                    # Success if we received events and have AI response text
+                    success = events_received > 0 and len(complete_ai_response) > 0
+                    if success:
+                        log.info("   ✅ Streaming test successful!")
                     else:
-                        print(f"   ❌ Streaming failed: {response.status_code}")
-                        return False
-                        
+                        log.error("   ❌ Streaming test failed - no AI response text")
+                    
+                    return success
+                else:
+                    log.error("   ❌ Streaming failed: %s", response.status_code)
+                    return False
+                    
         except Exception as e:
-            print(f"   ❌ Streaming endpoint test error: {e}")
+            log.error("   ❌ Streaming endpoint test error: %s", e)
             return False
     
+    @classmethod
+    async def _iter_sse_data(cls, response):
+        """Yield the raw payload of each `data: ` line, frame by frame"""
+        # Work on the undecoded byte stream and only split complete frames
+        data_prefix, frame_end = cls._DATA_PREFIX, cls._FRAME_END
+        prefix_len, frame_end_len = len(data_prefix), len(frame_end)
+        buffer = bytearray()
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            end = buffer.find(frame_end)
+            while end != -1:
+                frame = bytes(buffer[:end])
+                del buffer[:end + frame_end_len]
+                for line in frame.split(b"\n"):
+                    if line.startswith(data_prefix):
+                        yield line[prefix_len:]
+                end = buffer.find(frame_end)
+    
     async def test_chat_history_endpoint(self):
         """Test chat history endpoint"""
         try:
-            print("\n📚 Testing chat history endpoint...")
+            log.info("\n📚 Testing chat history endpoint...")
             
-            # Use session cookie for authentication
-            cookies = {"healthmate_session": self.session_cookie}
+            response = await self.http.get(
+                self.HISTORY_URL
+            )
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.fastapi_base_url}/api/chat/history",
-                    cookies=cookies
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('success'):
-                        messages = data.get('messages', [])
-                        print(f"   ✅ Chat history retrieved: {len(messages)} messages")
-                        return True
-                    else:
-                        print(f"   ❌ History retrieval failed: {data.get('error')}")
-                        return False
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('success'):
+                    messages = data.get('messages', [])
+                    log.info("   ✅ Chat history retrieved: %s messages", len(messages))
+                    return True
                 else:
-                    print(f"   ❌ History request failed: {response.status_code}")
+                    log.error("   ❌ History retrieval failed: %s", data.get('error'))
                     return False
-                    
+            else:
+                log.error("   ❌ History request failed: %s", response.status_code)
+                return False
+                
         except Exception as e:
-            print(f"   ❌ Chat history test error: {e}")
+            log.error("   ❌ Chat history test error: %s", e)
             return False
     
     async def run_e2e_tests(self):
         """Run all end-to-end tests"""
-        print("🧪 End-to-End HealthCoachAI Integration Test")
-        print("=" * 60)
-        print("Testing: Test Program -> FastAPI -> HealthCoachAI")
-        print()
+        log.info("🧪 End-to-End HealthCoachAI Integration Test")
+        log.info("=" * 60)
+        log.info("Testing: Test Program -> FastAPI -> HealthCoachAI")
+        log.info("")
+        
+        await self.open_http_client()
         
         # Start test server
-        if not self.start_test_server():
-            print("❌ Failed to start test server. Aborting tests.")
+        if not await self.start_test_server():
+            log.error("❌ Failed to start test server. Aborting tests.")
+            await self.close_http_client()
+            await self.stop_test_server()
             return False
         
         try:
             # Setup
             setup_success = await self.setup_test_user()
             if not setup_success:
-                print("❌ Test setup failed. Aborting tests.")
+                log.error("❌ Test setup failed. Aborting tests.")
                 return False
             
-            # Run tests
-            test_results = []
+            # Run tests (concurrently unless HEALTHMATE_E2E_SEQUENTIAL is set,
+            # which keeps their output apart for diagnostic runs)
+            tests = (
+                self.test_fastapi_health,
+                self.test_fastapi_chat_endpoint,
+                self.test_fastapi_streaming_endpoint,
+            )
+            
+            if env_flag("HEALTHMATE_E2E_SEQUENTIAL"):
+                test_results = [await test() for test in tests]
+            else:
+                results = await asyncio.gather(*(test() for test in tests), return_exceptions=True)
+                test_results = [result is True for result in results]
             
-            test_results.append(await self.test_fastapi_health())
-            test_results.append(await self.test_fastapi_chat_endpoint())
-            test_results.append(await self.test_fastapi_streaming_endpoint())
+            # The history test reads what the chat and streaming tests wrote,
+            # so it runs once they have finished
             test_results.append(await self.test_chat_history_endpoint())
             
             # Summary
             passed_tests = sum(test_results)
             total_tests = len(test_results)
             
-            print(f"\n📊 E2E Test Results:")
-            print(f"   Passed: {passed_tests}/{total_tests}")
-            print(f"   Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+            log.info("\n📊 E2E Test Results:")
+            log.info("   Passed: %s/%s", passed_tests, total_tests)
+            log.info("   Success Rate: %.1f%%", (passed_tests/total_tests)*100)
             
-            print(f"\n📋 Test Status:")
-            print(f"   - FastAPI Health: {'✅' if test_results[0] else '❌'}")
-            print(f"   - Chat Endpoint: {'✅' if test_results[1] else '❌'}")
-            print(f"   - Streaming Endpoint: {'✅' if test_results[2] else '❌'}")
-            print(f"   - Chat History: {'✅' if test_results[3] else '❌'}")
+            log.info("\n📋 Test Status:")
+            log.info("   - FastAPI Health: %s", '✅' if test_results[0] else '❌')
+            log.info("   - Chat Endpoint: %s", '✅' if test_results[1] else '❌')
+            log.info("   - Streaming Endpoint: %s", '✅' if test_results[2] else '❌')
+            log.info("   - Chat History: %s", '✅' if test_results[3] else '❌')
             
             if passed_tests == total_tests:
-                print("\n🎉 All E2E tests passed!")
-                print("✅ HealthCoachAI integration is working correctly!")
+                log.info("\n🎉 All E2E tests passed!")
+                log.info("✅ HealthCoachAI integration is working correctly!")
             else:
-                print("\n⚠️  Some E2E tests failed")
-                print("🔧 Check the error messages above for details")
+                log.warning("\n⚠️  Some E2E tests failed")
+                log.info("🔧 Check the error messages above for details")
             
             return passed_tests == total_tests
             
         finally:
             # Cleanup
-            print(f"\n🧹 Cleaning up test user...")
+            log.info("\n🧹 Cleaning up test user...")
             await self.cleanup_test_user()
+            await self.close_http_client()
             
             # Stop test server
-            self.stop_test_server()
+            await self.stop_test_server()
 
 
 async def main():
     """Main test function"""
-    print("🚀 Starting End-to-End HealthCoachAI Integration Test")
-    print("📋 Prerequisites:")
-    print("   - HealthCoachAI deployed and accessible via AgentCore")
-    print("   - Cognito User Pool configured")
-    print("   - AWS credentials configured")
-    print("   - Test will start its own FastAPI server")
-    print()
+    log.info("🚀 Starting End-to-End HealthCoachAI Integration Test")
+    log.info("📋 Prerequisites:")
+    log.info("   - HealthCoachAI deployed and accessible via AgentCore")
+    log.info("   - Cognito User Pool configured")
+    log.info("   - AWS credentials configured")
+    log.info("   - Test will start its own FastAPI server")
+    log.info("")
     
     test_suite = E2EHealthCoachTest()
     success = await test_suite.run_e2e_tests()
     
     if success:
-        print("\n🚀 E2E integration test completed successfully!")
-        print("✅ Ready to proceed with frontend implementation!")
+        log.info("\n🚀 E2E integration test completed successfully!")
+        log.info("✅ Ready to proceed with frontend implementation!")
     else:
-        print("\n🔧 E2E integration test failed.")
-        print("❌ Please check the configuration and try again.")
+        log.info("\n🔧 E2E integration test failed.")
+        log.error("❌ Please check the configuration and try again.")
     
     return success
 
 
 if __name__ == "__main__":
+    prepare_script_run()
+    
     try:
         result = asyncio.run(main())
         sys.exit(0 if result else 1)
     except KeyboardInterrupt:
-        print("\n\n👋 Test interrupted by user.")
+        log.info("\n\n👋 Test interrupted by user.")
         sys.exit(1)
     except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
+        log.error("\n❌ Unexpected error: %s", e)
         import traceback
         traceback.print_exc()
         sys.exit(1)
\ No newline at end of file
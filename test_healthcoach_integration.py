@@ -4,38 +4,57 @@ Healthmate-CoachAI Integration Test
 Test actual integration with deployed Healthmate-CoachAI service
 """
 import asyncio
+import functools
 import sys
-import os
+import time
 import uuid
-import boto3
-import hashlib
-import hmac
 import base64
-import json
 from datetime import datetime
 
-# Add the app directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
-
-from app.healthcoach.client import HealthCoachClient
+from app.healthcoach.client import HealthCoachClient, get_healthcoach_client
 from app.models.auth import UserInfo, CognitoTokens, UserSession
-from app.services.chat_service import ChatService
-from app.api.chat import send_message
+from app.services.chat_service import ChatService, get_chat_service
 from app.utils.config import get_config
+from app.utils.env import env_flag
+from app.utils.serialization import json_dumps
+from script_support import prepare_script_run
+
+
+# Pre-encoded mock JWT header: base64url of {"alg": "RS256", "typ": "JWT"}
+_MOCK_HEADER_B64 = "eyJhbGciOiAiUlMyNTYiLCAidHlwIjogIkpXVCJ9"
 
-# Test configuration
-config = get_config()
+
+def _encode_jwt_segment(segment: dict) -> str:
+    """Base64url-encode a JWT segment"""
+    return base64.urlsafe_b64encode(json_dumps(segment)).decode().rstrip('=')
 
 
 class HealthCoachIntegrationTest:
     """Integration test for HealthCoachAI"""
     
     def __init__(self):
-        self.config = config
-        self.cognito_client = boto3.client('cognito-idp', region_name=self.config.AWS_REGION)
         self.test_username = None
         self.jwt_token = None
         self.user_session = None
+    
+    # Shared services: the app's own process-wide instances, fetched on first use
+    
+    @functools.cached_property
+    def config(self):
+        return get_config()
+    
+    @functools.cached_property
+    def healthcoach_client(self) -> HealthCoachClient:
+        return get_healthcoach_client()
+    
+    @functools.cached_property
+    def chat_service(self) -> ChatService:
+        return get_chat_service()
+    
+    @functools.cached_property
+    def app(self):
+        from app.main import app
+        return app
         
     def calculate_secret_hash(self, username: str) -> str:
         """Calculate Cognito Client Secret Hash"""
@@ -46,6 +65,9 @@ class HealthCoachIntegrationTest:
     async def setup_test_user(self):
         """Set up a test user for integration testing"""
         try:
+            # Read the clock once for the claims and token expiry
+            now_ts = time.time()
+            
             print("🔐 Setting up test user for HealthCoachAI integration...")
             
             # Generate test user
@@ -63,16 +85,15 @@ class HealthCoachIntegrationTest:
                 "sub": str(uuid.uuid4()),
                 "email": test_email,
                 "username": self.test_username,
-                "exp": int((datetime.now().timestamp() + 3600)),  # 1 hour from now
-                "iat": int(datetime.now().timestamp()),
+                "exp": int(now_ts + 3600),  # 1 hour from now
+                "iat": int(now_ts),
                 "token_use": "access"
             }
             
             # Create mock JWT token (base64 encoded payload for testing)
-            header = base64.urlsafe_b64encode(json.dumps({"alg": "RS256", "typ": "JWT"}).encode()).decode().rstrip('=')
-            payload = base64.urlsafe_b64encode(json.dumps(mock_jwt_payload).encode()).decode().rstrip('=')
+            payload = _encode_jwt_segment(mock_jwt_payload)
             signature = "mock-signature"
-            self.jwt_token = f"{header}.{payload}.{signature}"
+            self.jwt_token = f"{_MOCK_HEADER_B64}.{payload}.{signature}"
             
             # Create user info
             user_info = UserInfo(
@@ -87,7 +108,7 @@ class HealthCoachIntegrationTest:
                 refresh_token="mock-refresh-token",
                 id_token="mock-id-token",
                 expires_in=3600,
-                expires_at=datetime.now()
+                expires_at=datetime.fromtimestamp(now_ts)
             )
             
             # Create user session
@@ -110,7 +131,7 @@ class HealthCoachIntegrationTest:
         try:
             print("\n🤖 Testing HealthCoachAI client direct connection...")
             
-            client = HealthCoachClient()
+            client = self.healthcoach_client
             print(f"   Runtime ID: {client.runtime_id}")
             
             # Test message
@@ -149,10 +170,10 @@ class HealthCoachIntegrationTest:
         try:
             print("\n💬 Testing chat service integration...")
             
-            chat_service = ChatService()
+            chat_service = self.chat_service
             
             # Create a test session
-            session = chat_service.create_session(self.user_session.user_info.user_id)
+            session = chat_service.get_or_create_session(self.user_session.user_info.user_id)
             print(f"   Chat session created: {session.session_id}")
             
             # Add a test message
@@ -193,7 +214,7 @@ class HealthCoachIntegrationTest:
             
             # Test SSE format conversion
             sse_format = test_event.to_sse_format()
-            assert '"event_type": "test"' in sse_format
+            assert b'"event_type":"test"' in sse_format
             print(f"   SSE format conversion: ✅")
             
             # Test chat request with streaming
@@ -220,13 +241,10 @@ class HealthCoachIntegrationTest:
             print("\n🔗 Testing API endpoints structure...")
             
             # Test that we can import and create the FastAPI app
-            from app.main import app
+            app = self.app
             
             # Get the routes
-            routes = []
-            for route in app.routes:
-                if hasattr(route, 'path'):
-                    routes.append(route.path)
+            routes = {route.path for route in app.routes if hasattr(route, 'path')}
             
             # Check for expected endpoints
             expected_endpoints = [
@@ -239,10 +257,9 @@ class HealthCoachIntegrationTest:
                 '/api/healthcoach/chat/stream'
             ]
             
-            found_endpoints = []
+            found_endpoints = [endpoint for endpoint in expected_endpoints if endpoint in routes]
             for endpoint in expected_endpoints:
                 if endpoint in routes:
-                    found_endpoints.append(endpoint)
                     print(f"   ✅ {endpoint}")
                 else:
                     print(f"   ❌ {endpoint} - Not found")
@@ -266,13 +283,24 @@ class HealthCoachIntegrationTest:
             print("❌ Test setup failed. Aborting tests.")
             return False
         
-        # Run tests
-        test_results = []
+        # Run tests (they share only the read-only user session, so run them
+        # concurrently unless HEALTHMATE_INTEGRATION_SEQUENTIAL is set, which
+        # keeps their output apart for diagnostic runs)
+        tests = (
+            self.test_healthcoach_client_direct,
+            self.test_chat_service_integration,
+            self.test_streaming_functionality,
+            self.test_api_endpoints_structure,
+        )
         
-        test_results.append(await self.test_healthcoach_client_direct())
-        test_results.append(await self.test_chat_service_integration())
-        test_results.append(await self.test_streaming_functionality())
-        test_results.append(await self.test_api_endpoints_structure())
+        if env_flag("HEALTHMATE_INTEGRATION_SEQUENTIAL"):
+            results = [await test() for test in tests]
+        else:
+            results = await asyncio.gather(*(test() for test in tests), return_exceptions=True)
+            for test, result in zip(tests, results):
+                if isinstance(result, BaseException):
+                    print(f"❌ {test.__name__} raised {type(result).__name__}: {result}")
+        test_results = [result is True for result in results]
         
         # Summary
         passed_tests = sum(test_results)
@@ -315,6 +343,8 @@ async def main():
 
 
 if __name__ == "__main__":
+    prepare_script_run()
+    
     try:
         result = asyncio.run(main())
         sys.exit(0 if result else 1)
@@ -6,16 +6,39 @@ Test basic JWT processing without full verification
 import asyncio
 import httpx
 import base64
-import json
 
+from app.utils.serialization import json_dumps
+from script_support import prepare_script_run
 
-async def test_simple_jwt_processing():
-    """Test simple JWT processing"""
+
+FASTAPI_BASE_URL = "http://localhost"
+
+# Pre-encoded mock JWT header: base64url of {"alg": "RS256", "typ": "JWT", "kid": "test-key"}
+_MOCK_HEADER_B64 = "eyJhbGciOiAiUlMyNTYiLCAidHlwIjogIkpXVCIsICJraWQiOiAidGVzdC1rZXkifQ"
+
+
+def _encode_jwt_segment(segment: dict) -> str:
+    """Base64url-encode a JWT segment"""
+    return base64.urlsafe_b64encode(json_dumps(segment)).decode().rstrip('=')
+
+
+def _app_client() -> httpx.AsyncClient:
+    """HTTP client that dispatches requests to the FastAPI app in-process"""
+    from app.main import app
+    
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url=FASTAPI_BASE_URL,
+        timeout=30.0
+    )
+
+
+async def check_simple_jwt_processing(client: httpx.AsyncClient):
+    """Test simple JWT processing against the app through client"""
     print("🧪 Testing Simple JWT Processing")
     print("=" * 50)
     
     # Create a simple mock JWT token
-    header = {"alg": "RS256", "typ": "JWT", "kid": "test-key"}
     payload = {
         "sub": "test-user-123",
         "email": "test@example.com",
@@ -27,9 +50,8 @@ async def test_simple_jwt_processing():
     }
     
     # Encode (without signature for testing)
-    header_b64 = base64.urlsafe_b64encode(json.dumps(header).encode()).decode().rstrip('=')
-    payload_b64 = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
-    mock_jwt = f"{header_b64}.{payload_b64}.mock-signature"
+    payload_b64 = _encode_jwt_segment(payload)
+    mock_jwt = f"{_MOCK_HEADER_B64}.{payload_b64}.mock-signature"
     
     print(f"Mock JWT: {mock_jwt[:50]}...")
     
@@ -46,31 +68,30 @@ async def test_simple_jwt_processing():
             "language": "ja"
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "http://localhost:8000/api/chat/send",
-                json=chat_request,
-                headers=headers
-            )
-            
-            print(f"Response status: {response.status_code}")
-            print(f"Response headers: {dict(response.headers)}")
+        response = await client.post(
+            "/api/chat/send",
+            json=chat_request,
+            headers=headers
+        )
+        
+        print(f"Response status: {response.status_code}")
+        print(f"Response headers: {dict(response.headers)}")
+        
+        if response.status_code == 401:
+            print("❌ Still getting 401 - authentication middleware issue")
+            try:
+                error_data = response.json()
+                print(f"Error details: {error_data}")
+            except:
+                print(f"Error text: {response.text}")
+        elif response.status_code == 200:
+            print("✅ Authentication passed!")
+            data = response.json()
+            print(f"Response: {data}")
+        else:
+            print(f"⚠️  Unexpected status: {response.status_code}")
+            print(f"Response: {response.text}")
             
-            if response.status_code == 401:
-                print("❌ Still getting 401 - authentication middleware issue")
-                try:
-                    error_data = response.json()
-                    print(f"Error details: {error_data}")
-                except:
-                    print(f"Error text: {response.text}")
-            elif response.status_code == 200:
-                print("✅ Authentication passed!")
-                data = response.json()
-                print(f"Response: {data}")
-            else:
-                print(f"⚠️  Unexpected status: {response.status_code}")
-                print(f"Response: {response.text}")
-                
     except Exception as e:
         print(f"❌ Request error: {e}")
 
@@ -82,10 +103,6 @@ async def test_direct_middleware():
     
     try:
         # Import and test middleware components
-        import sys
-        import os
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
-        
         from app.auth.middleware import AuthenticationMiddleware
         from app.auth.cognito import get_cognito_client
         
@@ -110,8 +127,12 @@ async def test_direct_middleware():
 async def main():
     """Main test function"""
     await test_direct_middleware()
-    await test_simple_jwt_processing()
+    
+    async with _app_client() as client:
+        await check_simple_jwt_processing(client)
 
 
 if __name__ == "__main__":
+    prepare_script_run()
+    
     asyncio.run(main())
\ No newline at end of file
@@ -4,19 +4,38 @@ Streaming functionality test
 Simple test to verify the unified chat API streaming functionality works correctly
 """
 import sys
-import os
 import asyncio
+import json
 
-# Add the app directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+from app.models.chat import StreamingEvent, ChatRequest, StreamingMessageRequest
+from app.utils.env import env_flag
+from script_support import prepare_script_run
 
-from app.models.chat import StreamingEvent, ChatRequest
+# Detail lines (e.g. the raw SSE frame) are only formatted when HEALTHMATE_TEST_DEBUG=1
+DEBUG = env_flag("HEALTHMATE_TEST_DEBUG")
+
+# Streaming request models to validate: the deprecated dedicated model and
+# the unified ChatRequest with the stream flag
+REQUEST_MODEL_CASES = [
+    (StreamingMessageRequest, {}),
+    (ChatRequest, {"stream": True}),
+]
 
 
 async def test_streaming_functionality():
     """Test streaming functionality"""
-    print("🧪 Testing Unified Chat API Streaming Functionality")
-    print("=" * 50)
+    # Collect the report and write it in one go instead of a print per line
+    out = []
+    try:
+        await _check_streaming_functionality(out.append)
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+async def _check_streaming_functionality(log):
+    """Run the streaming checks, reporting each line through log"""
+    log("🧪 Testing Unified Chat API Streaming Functionality")
+    log("=" * 50)
     
     # Test streaming event model
     try:
@@ -26,49 +45,60 @@ async def test_streaming_functionality():
             data={"key": "value"}
         )
         sse_format = event.to_sse_format()
-        print(f"✅ StreamingEvent SSE format: {sse_format[:50]}...")
+        assert sse_format.startswith(b"data: ")
+        log("✅ StreamingEvent SSE format: Valid")
+        if DEBUG:
+            log(f"   SSE frame: {event.to_sse_str()[:50]}...")
     except Exception as e:
-        print(f"❌ StreamingEvent test failed: {e}")
+        log(f"❌ StreamingEvent test failed: {e}")
         return
     
-    # Test chat request validation
+    # Test streaming request validation
     try:
-        request = ChatRequest(
-            message="Hello, this is a streaming test",
-            timezone="Asia/Tokyo",
-            language="ja",
-            stream=True
-        )
-        print(f"✅ ChatRequest validation: {request.message} (stream={request.stream})")
+        for request_cls, extra in REQUEST_MODEL_CASES:
+            request = request_cls(
+                message="Hello, this is a streaming test",
+                timezone="Asia/Tokyo",
+                language="ja",
+                **extra
+            )
+            stream_note = f" (stream={request.stream})" if "stream" in request_cls.model_fields else ""
+            log(f"✅ {request_cls.__name__} validation: {request.message}{stream_note}")
     except Exception as e:
-        print(f"❌ ChatRequest validation failed: {e}")
+        log(f"❌ Streaming request validation failed: {e}")
         return
     
     # Test streaming event types
     try:
         event_types = ["start", "chunk", "user_message", "ai_message_complete", "complete", "error", "keepalive"]
+        
         for event_type in event_types:
             event = StreamingEvent(event_type=event_type, message=f"Test {event_type} event")
             sse_data = event.to_sse_format()
-            # Check that the event_type is in the JSON data
-            assert f'"event_type": "{event_type}"' in sse_data
-            print(f"✅ Event type '{event_type}': Valid SSE format")
+            assert sse_data.startswith(b"data: ") and sse_data.endswith(b"\n\n")
+            payload = json.loads(sse_data[len(b"data: "):-2])
+            assert payload["event_type"] == event_type
+            assert payload["message"] == f"Test {event_type} event"
+            log(f"✅ Event type '{event_type}': Valid SSE format")
     except Exception as e:
-        print(f"❌ Event type test failed: {e}")
+        log(f"❌ Event type test failed: {e}")
         return
     
-    print("\n📋 Unified Chat API Streaming Summary:")
-    print("- StreamingEvent model: ✅ Working")
-    print("- SSE format conversion: ✅ Working")
-    print("- ChatRequest with stream flag: ✅ Working")
-    print("- Event type validation: ✅ Working")
-    print("- Unified API endpoint: ✅ Created (/api/chat/send)")
-    print("- Stream parameter support: ✅ Implemented")
-    print("- htmx compatibility: ✅ Implemented")
+    log("\n📋 Unified Chat API Streaming Summary:")
+    log("- StreamingEvent model: ✅ Working")
+    log("- SSE format conversion: ✅ Working")
+    log("- ChatRequest with stream flag: ✅ Working")
+    log("- Event type validation: ✅ Working")
+    log("- Unified API endpoint: ✅ Created (/api/chat/send)")
+    log("- Stream parameter support: ✅ Implemented")
+    log("- htmx compatibility: ✅ Implemented")
     
-    print("\n🚀 Streaming functionality integrated into unified chat API")
-    print("💡 Use /api/chat/send with stream=true for streaming responses")
+    log("\n🚀 Streaming functionality integrated into unified chat API")
+    log("💡 Use /api/chat/send with stream=true for streaming responses")
 
 
 if __name__ == "__main__":
-    asyncio.run(test_streaming_functionality())
\ No newline at end of file
+    prepare_script_run()
+    
+    with asyncio.Runner() as runner:
+        runner.run(test_streaming_functionality())
\ No newline at end of file